@@ -94,9 +94,10 @@ export const fetchUsers = async (): Promise<User[]> => {
   }));
 };
 
-export const calculateScore = async (userId: string): Promise<ScoreResponse & { advanced: AdvancedMetrics }> => {
+export const calculateScore = async (userId: string, fullRescore = false): Promise<ScoreResponse & { advanced: AdvancedMetrics }> => {
   try {
-    const response = await fetch(`${API_BASE}/calculate-score/${userId}`, {
+    const query = fullRescore ? '?full_rescore=true' : '';
+    const response = await fetch(`${API_BASE}/calculate-score/${userId}${query}`, {
       method: 'POST',
       mode: 'cors',
       credentials: 'omit',
@@ -130,4 +131,133 @@ export const calculateScore = async (userId: string): Promise<ScoreResponse & {
     }
     throw error;
   }
-};
\ No newline at end of file
+};
+
+/**
+ * Scores many users in one request. The server streams one NDJSON line per
+ * user as soon as that user's score is ready; onResult is called for each.
+ */
+export const calculateScoresBatch = async (
+  userIds: string[] | undefined,
+  onResult: (userId: string, result: ScoreResponse | null, error?: string) => void,
+  concurrency = 4
+): Promise<void> => {
+  const response = await fetch(`${API_BASE}/calculate-score:batch`, {
+    method: 'POST',
+    mode: 'cors',
+    credentials: 'omit',
+    headers: {
+      'Accept': 'application/x-ndjson',
+      'Content-Type': 'application/json',
+    },
+    body: JSON.stringify({ user_ids: userIds, concurrency })
+  });
+
+  if (!response.ok || !response.body) {
+    const errorText = await response.text();
+    throw new Error(`POST /calculate-score:batch failed: ${response.status} - ${errorText}`);
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffered = '';
+
+  const emit = (line: string) => {
+    if (!line.trim()) return;
+    const item = JSON.parse(line);
+    onResult(item.user_id, item.result ?? null, item.error);
+  };
+
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffered += decoder.decode(value, { stream: true });
+    const lines = buffered.split('\n');
+    buffered = lines.pop() ?? '';
+    lines.forEach(emit);
+  }
+  emit(buffered);
+};
+
+
+export interface ScoreJob {
+  job_id: string;
+  user_id: string;
+  status: 'queued' | 'running' | 'done' | 'failed';
+  priority: number;
+  created_at: number;
+  started_at: number | null;
+  finished_at: number | null;
+  result: ScoreResponse | null;
+  error: string | null;
+}
+
+/**
+ * Queues a score calculation and returns its job id immediately.
+ */
+export const queueScore = async (userId: string, priority = 0): Promise<string> => {
+  const response = await fetch(`${API_BASE}/calculate-score/${userId}?async=true&priority=${priority}`, {
+    method: 'POST',
+    mode: 'cors',
+    credentials: 'omit',
+    headers: { 'Accept': 'application/json' }
+  });
+  if (!response.ok) {
+    const errorText = await response.text();
+    throw new Error(`POST /calculate-score/${userId}?async=true failed: ${response.status} - ${errorText}`);
+  }
+  const data = await response.json();
+  return data.job_id;
+};
+
+export const fetchJob = async (jobId: string): Promise<ScoreJob> => {
+  const response = await fetch(`${API_BASE}/jobs/${jobId}`, {
+    method: 'GET',
+    mode: 'cors',
+    credentials: 'omit',
+    headers: { 'Accept': 'application/json' }
+  });
+  if (!response.ok) {
+    const errorText = await response.text();
+    throw new Error(`GET /jobs/${jobId} failed: ${response.status} - ${errorText}`);
+  }
+  return response.json();
+};
+
+
+export interface StoredScore {
+  scored_at: number;
+  model: string;
+  result: ScoreResponse;
+}
+
+const getJson = async <T>(path: string): Promise<T> => {
+  const response = await fetch(`${API_BASE}${path}`, {
+    method: 'GET',
+    mode: 'cors',
+    credentials: 'omit',
+    headers: { 'Accept': 'application/json' }
+  });
+  if (!response.ok) {
+    const errorText = await response.text();
+    throw new Error(`GET ${path} failed: ${response.status} - ${errorText}`);
+  }
+  return response.json();
+};
+
+/**
+ * Latest stored score for a user, or null if they were never scored.
+ * Reads the score store only; never triggers an LLM call.
+ */
+export const fetchLatestScore = async (userId: string): Promise<StoredScore | null> => {
+  try {
+    return await getJson<StoredScore>(`/scores/${userId}`);
+  } catch (error) {
+    return null;
+  }
+};
+
+export const fetchScoreHistory = async (userId: string, limit = 50): Promise<StoredScore[]> => {
+  const data = await getJson<{ user_id: string; scores: StoredScore[] }>(`/scores/${userId}/history?limit=${limit}`);
+  return data.scores;
+};
@@ -58,10 +58,25 @@ export interface AdvancedMetrics {
   score_history: { month: string; score: number }[]; // Trend analysis
 }
 
+export interface PromptMetadata {
+  budget_tokens: number;
+  evidence_chars: number;
+  evidence_tokens: number;
+  prompt_chars: number;
+  prompt_tokens: number;
+  section_tokens: Record<string, number>;
+  truncated_items: number;
+  dropped_items: number;
+  over_budget: boolean;
+  mode: 'full' | 'delta' | 'unchanged';
+  llm_calls: number;
+}
+
 export interface ScoreResponse {
   analysis_summary: AnalysisSummary;
   variables: Variables;
   final_score?: number; 
+  metadata?: PromptMetadata;
 }
 
 export interface FullUserPerformance extends User, ScoreResponse {
@@ -0,0 +1,478 @@
+import json
+import mmap
+import os
+import sys
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping, Sequence
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from helper import CommitStore, SlackUserIndex, _to_int
+from records import Commit
+
+# Bump whenever the section layout below changes; older files are then ignored
+FORMAT_VERSION = 1
+MAGIC = b"WSNAPv1\0"
+
+# Layout:
+#   MAGIC | u64 header length | JSON header | sections (each 8-byte aligned)
+# The header records the source stamp the file was compiled from and, for
+# every section, its (offset, byte length, array typecode). Strings that
+# repeat across records (user ids, channel ids, areas, meeting ids) live once
+# in the symbol table; free text lives in the text blob. Both are addressed
+# through fixed-width offset columns, so nothing is decoded until read.
+
+_MISSING = object()
+
+
+class _Interner:
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.offsets = array("Q", [0])
+        self.blob = array("B")
+
+    def add(self, value: str) -> int:
+        sid = self.ids.get(value)
+        if sid is None:
+            sid = self.ids[value] = len(self.ids)
+            self.blob.frombytes(value.encode("utf-8"))
+            self.offsets.append(len(self.blob))
+        return sid
+
+
+class _TextTable:
+    def __init__(self):
+        self.offsets = array("Q", [0])
+        self.blob = array("B")
+
+    def add(self, value: str) -> int:
+        self.blob.frombytes(value.encode("utf-8"))
+        self.offsets.append(len(self.blob))
+        return len(self.offsets) - 2
+
+
+class SnapshotWriter:
+    """
+    Builds a binary snapshot one record at a time, so sources can be streamed
+    straight into its columns without ever holding their parsed records.
+    A channel's messages are added before the channel itself and a meeting's
+    transcript lines before the meeting, the order stream_json delivers them
+    in. write() then derives the per-user indexes from what was added.
+    """
+
+    def __init__(self):
+        self.syms = _Interner()
+        self.texts = _TextTable()
+        self.sections: Dict[str, array] = {}
+        self.extras = {"slack": {}, "github": {}}
+        column = self._column
+
+        # Slack
+        self.slack_users = column("slack_users", "I")
+        self.chan_id, self.chan_start = column("chan_id", "I"), column("chan_msg_start", "Q")
+        self.msg_ts, self.msg_user = column("msg_ts", "I"), column("msg_user", "q")
+        self.msg_text, self.msg_flags = column("msg_text", "I"), column("msg_flags", "B")
+        self.chan_start.append(0)
+        # Slack user index as CSR: entries [idx_start[u], idx_start[u+1]) belong to idx_user[u]
+        for name, typecode in (("slack_idx_user", "I"), ("slack_idx_start", "Q"),
+                               ("slack_idx_chan", "I"), ("slack_idx_msg", "I")):
+            column(name, typecode)
+        # {user sid: (channel positions, message positions)} in message order
+        self._messages_by_user: Dict[int, Tuple[array, array]] = {}
+
+        # GitHub commits, in export order
+        self.c_sha, self.c_author = column("c_sha", "I"), column("c_author", "q")
+        self.c_email, self.c_date = column("c_email", "I"), column("c_date", "I")
+        self.c_message, self.c_area = column("c_message", "I"), column("c_area", "I")
+        self.c_diff, self.c_files = column("c_diff", "I"), column("c_files", "q")
+        self.c_added, self.c_deleted = column("c_added", "q"), column("c_deleted", "q")
+        # Commit store as CSR of date-sorted row numbers per author
+        for name, typecode in (("cs_author", "I"), ("cs_start", "Q"), ("cs_row", "Q")):
+            column(name, typecode)
+        # {author sid: commit rows} in export order
+        self._commits_by_author: Dict[int, array] = {}
+
+        # Meetings
+        self.m_id, self.m_start = column("m_id", "I"), column("m_line_start", "Q")
+        self.l_user, self.l_text = column("l_user", "I"), column("l_text", "I")
+        self.m_start.append(0)
+
+    def _column(self, name: str, typecode: str) -> array:
+        self.sections[name] = array(typecode)
+        return self.sections[name]
+
+    def add_message(self, msg: Dict):
+        channel_pos = len(self.chan_id)
+        message_pos = len(self.msg_ts) - self.chan_start[-1]
+        self.msg_ts.append(self.texts.add(msg["ts"]))
+        user = self.syms.add(msg["user"]) if "user" in msg else -1
+        self.msg_user.append(user)
+        self.msg_text.append(self.texts.add(msg["text"]))
+        # bit 0: contains_code key present, bit 1: its value
+        flags = 0
+        if "contains_code" in msg:
+            flags = 1 | (2 if msg["contains_code"] else 0)
+        self.msg_flags.append(flags)
+        if user >= 0:
+            channels, messages = self._messages_by_user.setdefault(user, (array("I"), array("I")))
+            channels.append(channel_pos)
+            messages.append(message_pos)
+
+    def add_channel(self, channel: Dict):
+        self.chan_id.append(self.syms.add(channel["channel_id"]))
+        self.chan_start.append(len(self.msg_ts))
+
+    def add_slack_document(self, slack_data: Dict):
+        """
+        Record the Slack user list and any top-level keys besides the channels
+        """
+        for user in slack_data.get("users", []):
+            self.slack_users.append(self.syms.add(user))
+        self.extras["slack"] = {k: v for k, v in slack_data.items() if k not in ("users", "channels")}
+
+    def add_commit(self, commit: Dict):
+        row = len(self.c_sha)
+        self.c_sha.append(self.texts.add(commit["sha"]))
+        author = self.syms.add(commit["author"]) if "author" in commit else -1
+        self.c_author.append(author)
+        self.c_email.append(self.syms.add(commit.get("email", "")))
+        self.c_date.append(self.texts.add(commit["date"]))
+        self.c_message.append(self.texts.add(commit["commit_message"]))
+        self.c_area.append(self.syms.add(commit["area"]))
+        self.c_diff.append(self.texts.add(commit["codediff"]))
+        self.c_files.append(_to_int(commit["files_changed"]))
+        self.c_added.append(_to_int(commit["lines_added"]))
+        self.c_deleted.append(_to_int(commit["lines_deleted"]))
+        if author >= 0:
+            self._commits_by_author.setdefault(author, array("Q")).append(row)
+
+    def add_github_document(self, github_data: Dict):
+        """
+        Record any top-level GitHub keys besides the commits
+        """
+        self.extras["github"] = {k: v for k, v in github_data.items() if k != "commits"}
+
+    def add_line(self, line: Dict):
+        self.l_user.append(self.syms.add(line["user"]))
+        self.l_text.append(self.texts.add(line["text"]))
+
+    def add_meeting(self, meeting: Dict):
+        self.m_id.append(self.syms.add(meeting["meeting_id"]))
+        self.m_start.append(len(self.l_user))
+
+    def _build_indexes(self):
+        sections = self.sections
+        idx_user, idx_start = sections["slack_idx_user"], sections["slack_idx_start"]
+        idx_chan, idx_msg = sections["slack_idx_chan"], sections["slack_idx_msg"]
+        idx_start.append(0)
+        # Channels arrive one after another, so each user's messages are
+        # already grouped by channel the way SlackUserIndex keeps them
+        for user, (channels, messages) in self._messages_by_user.items():
+            idx_user.append(user)
+            idx_chan.extend(channels)
+            idx_msg.extend(messages)
+            idx_start.append(len(idx_chan))
+
+        cs_author, cs_start, cs_row = sections["cs_author"], sections["cs_start"], sections["cs_row"]
+        c_date, text_off, text_blob = sections["c_date"], self.texts.offsets, self.texts.blob
+
+        def date_bytes(row: int) -> bytes:
+            # ISO-8601 dates order the same as their UTF-8 bytes
+            tid = c_date[row]
+            return text_blob[text_off[tid]:text_off[tid + 1]].tobytes()
+
+        cs_start.append(0)
+        for author, rows in self._commits_by_author.items():
+            cs_author.append(author)
+            # Stable sort keeps export order for commits sharing a timestamp
+            cs_row.extend(sorted(rows, key=date_bytes))
+            cs_start.append(len(cs_row))
+
+    def write(self, path: str, stamp):
+        """
+        Write the snapshot to path, stamped with the sources it was compiled
+        from. The file is written beside the target and renamed into place so
+        readers never map a half-written file.
+        """
+        self._build_indexes()
+        sections = self.sections
+        sections["sym_off"], sections["sym_blob"] = self.syms.offsets, self.syms.blob
+        sections["text_off"], sections["text_blob"] = self.texts.offsets, self.texts.blob
+
+        layout = {}
+        offset = 0
+        for name, arr in sections.items():
+            offset = (offset + 7) & ~7
+            layout[name] = [offset, len(arr) * arr.itemsize, arr.typecode]
+            offset += len(arr) * arr.itemsize
+        header = json.dumps({
+            "version": FORMAT_VERSION,
+            "byteorder": sys.byteorder,
+            "stamp": stamp,
+            "extras": self.extras,
+            "sections": layout,
+        }).encode("utf-8")
+        data_start = (len(MAGIC) + 8 + len(header) + 7) & ~7
+
+        tmp_path = f"{path}.tmp{os.getpid()}"
+        with open(tmp_path, "wb") as f:
+            f.write(MAGIC)
+            f.write(len(header).to_bytes(8, "little"))
+            f.write(header)
+            for name, arr in sections.items():
+                f.seek(data_start + layout[name][0])
+                arr.tofile(f)
+            f.truncate(data_start + offset)
+        os.replace(tmp_path, path)
+
+
+class _Record(Mapping):
+    """
+    Read-only dict view of one row; fields decode from the mapped file on access
+    """
+    __slots__ = ("_fields", "_row")
+
+    def __init__(self, fields: Dict[str, Callable[[int], Any]], row: int):
+        self._fields = fields
+        self._row = row
+
+    def __getitem__(self, key):
+        value = self._fields[key](self._row)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self):
+        return (k for k, getter in self._fields.items() if getter(self._row) is not _MISSING)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+
+class _RecordList(Sequence):
+    """
+    Read-only list view over rows [start, stop) of one table
+    """
+    __slots__ = ("_fields", "_start", "_stop")
+
+    def __init__(self, fields: Dict[str, Callable[[int], Any]], start: int, stop: int):
+        self._fields = fields
+        self._start = start
+        self._stop = stop
+
+    def __len__(self):
+        return self._stop - self._start
+
+    def __getitem__(self, i):
+        n = self._stop - self._start
+        if isinstance(i, slice):
+            lo, hi, step = i.indices(n)
+            if step != 1:
+                return [self[j] for j in range(lo, hi, step)]
+            return _RecordList(self._fields, self._start + lo, self._start + max(lo, hi))
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError(i)
+        return _Record(self._fields, self._start + i)
+
+
+class _LazyColumn(Sequence):
+    __slots__ = ("_get", "_rows")
+
+    def __init__(self, get: Callable[[int], Any], rows):
+        self._get = get
+        self._rows = rows
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __getitem__(self, i):
+        return self._get(self._rows[i])
+
+
+class CompiledSlackUserIndex(SlackUserIndex):
+    """
+    SlackUserIndex backed by the snapshot's CSR columns
+    """
+
+    def __init__(self, snap: "CompiledWorkspace"):
+        super().__init__()
+        self._snap = snap
+        self._entry = {snap.sym(sid): u for u, sid in enumerate(snap.col("slack_idx_user"))}
+
+    def add(self, channel_pos: int, message_pos: int, msg: Dict):
+        raise TypeError("compiled index is read-only")
+
+    def users(self) -> List[str]:
+        return list(self._entry)
+
+    def channels_for(self, user_id: str) -> Dict[int, List[int]]:
+        u = self._entry.get(user_id)
+        if u is None:
+            return {}
+        start = self._snap.col("slack_idx_start")
+        chans, msgs = self._snap.col("slack_idx_chan"), self._snap.col("slack_idx_msg")
+        grouped: Dict[int, List[int]] = {}
+        for j in range(start[u], start[u + 1]):
+            grouped.setdefault(chans[j], []).append(msgs[j])
+        return grouped
+
+
+class CompiledCommitStore(CommitStore):
+    """
+    CommitStore backed by the snapshot's per-author, date-sorted row lists
+    """
+
+    def __init__(self, snap: "CompiledWorkspace"):
+        super().__init__()
+        self._snap = snap
+        self._entry = {snap.sym(sid): a for a, sid in enumerate(snap.col("cs_author"))}
+
+    def add(self, commit: Dict):
+        raise TypeError("compiled commit store is read-only")
+
+    def authors(self) -> List[str]:
+        return list(self._entry)
+
+    def for_author(self, user_id: str, since: Optional[str] = None, until: Optional[str] = None) -> List[Commit]:
+        a = self._entry.get(user_id)
+        if a is None:
+            return []
+        snap = self._snap
+        start = snap.col("cs_start")
+        rows = snap.col("cs_row")[start[a]:start[a + 1]]
+        dates = _LazyColumn(lambda r: snap.text(snap.col("c_date")[r]), rows)
+        lo = bisect_left(dates, since) if since is not None else 0
+        hi = bisect_left(dates, until) if until is not None else len(rows)
+        return [snap.commit_record(rows[i]) for i in range(lo, hi)]
+
+
+class CompiledWorkspace:
+    """
+    A memory-mapped binary snapshot. The mapping is shared through the OS
+    page cache, so every worker that opens the same file reuses its pages.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a workspace snapshot")
+        header_len = int.from_bytes(self._mm[len(MAGIC):len(MAGIC) + 8], "little")
+        header_end = len(MAGIC) + 8 + header_len
+        self.header = json.loads(self._mm[len(MAGIC) + 8:header_end])
+        self._base = (header_end + 7) & ~7
+        self._cols: Dict[str, memoryview] = {}
+        self._syms: Dict[int, str] = {}
+        self._view = memoryview(self._mm)
+
+    @property
+    def stamp(self) -> Tuple[Tuple[int, int], ...]:
+        return tuple(tuple(s) for s in self.header["stamp"])
+
+    def col(self, name: str) -> memoryview:
+        view = self._cols.get(name)
+        if view is None:
+            offset, length, typecode = self.header["sections"][name]
+            start = self._base + offset
+            view = self._view[start:start + length].cast(typecode)
+            self._cols[name] = view
+        return view
+
+    def sym(self, sid: int) -> str:
+        # Symbols are few and hot (ids compared in every extractor loop), so keep them decoded
+        value = self._syms.get(sid)
+        if value is None:
+            off = self.col("sym_off")
+            value = self._syms[sid] = str(self.col("sym_blob")[off[sid]:off[sid + 1]], "utf-8")
+        return value
+
+    def text(self, tid: int) -> str:
+        off = self.col("text_off")
+        return str(self.col("text_blob")[off[tid]:off[tid + 1]], "utf-8")
+
+    def commit_record(self, row: int) -> Commit:
+        return Commit(
+            sha=self.text(self.col("c_sha")[row]),
+            date=self.text(self.col("c_date")[row]),
+            message=self.text(self.col("c_message")[row]),
+            files_changed=self.col("c_files")[row],
+            lines_added=self.col("c_added")[row],
+            lines_deleted=self.col("c_deleted")[row],
+            area=self.sym(self.col("c_area")[row]),
+            codediff=self.text(self.col("c_diff")[row])
+        )
+
+    def _sym_or_missing(self, name: str) -> Callable[[int], Any]:
+        return lambda r: self.sym(self.col(name)[r]) if self.col(name)[r] >= 0 else _MISSING
+
+    def slack_data(self) -> Dict:
+        col, sym, text = self.col, self.sym, self.text
+
+        def contains_code(r):
+            flags = col("msg_flags")[r]
+            return bool(flags & 2) if flags & 1 else _MISSING
+
+        message_fields = {
+            "ts": lambda r: text(col("msg_ts")[r]),
+            "user": self._sym_or_missing("msg_user"),
+            "text": lambda r: text(col("msg_text")[r]),
+            "contains_code": contains_code,
+        }
+        chan_start = col("chan_msg_start")
+        channel_fields = {
+            "channel_id": lambda r: sym(col("chan_id")[r]),
+            "messages": lambda r: _RecordList(message_fields, chan_start[r], chan_start[r + 1]),
+        }
+        slack_data = dict(self.header["extras"]["slack"])
+        slack_data["users"] = [sym(sid) for sid in col("slack_users")]
+        slack_data["channels"] = _RecordList(channel_fields, 0, len(col("chan_id")))
+        return slack_data
+
+    def github_data(self) -> Dict:
+        col, sym, text = self.col, self.sym, self.text
+        commit_fields = {
+            "sha": lambda r: text(col("c_sha")[r]),
+            "author": self._sym_or_missing("c_author"),
+            "email": lambda r: sym(col("c_email")[r]),
+            "date": lambda r: text(col("c_date")[r]),
+            "files_changed": lambda r: col("c_files")[r],
+            "lines_added": lambda r: col("c_added")[r],
+            "lines_deleted": lambda r: col("c_deleted")[r],
+            "commit_message": lambda r: text(col("c_message")[r]),
+            "area": lambda r: sym(col("c_area")[r]),
+            "codediff": lambda r: text(col("c_diff")[r]),
+        }
+        github_data = dict(self.header["extras"]["github"])
+        github_data["commits"] = _RecordList(commit_fields, 0, len(col("c_sha")))
+        return github_data
+
+    def transcripts_data(self) -> Sequence:
+        col, sym, text = self.col, self.sym, self.text
+        line_fields = {
+            "user": lambda r: sym(col("l_user")[r]),
+            "text": lambda r: text(col("l_text")[r]),
+        }
+        m_start = col("m_line_start")
+        meeting_fields = {
+            "meeting_id": lambda r: sym(col("m_id")[r]),
+            "transcript": lambda r: _RecordList(line_fields, m_start[r], m_start[r + 1]),
+        }
+        return _RecordList(meeting_fields, 0, len(col("m_id")))
+
+
+def open_snapshot(path: str, stamp) -> Optional[CompiledWorkspace]:
+    """
+    Map the compiled snapshot at path if it exists and was compiled from
+    sources matching stamp; return None when it is missing or stale.
+    """
+    try:
+        compiled = CompiledWorkspace(path)
+    except (FileNotFoundError, ValueError):
+        return None
+    header = compiled.header
+    if (header.get("version") != FORMAT_VERSION or header.get("byteorder") != sys.byteorder
+            or compiled.stamp != tuple(stamp)):
+        return None
+    return compiled
@@ -1,5 +1,11 @@
 import json
-from typing import List, Dict
+from collections import deque
+import re
+import sys
+from bisect import bisect_left
+from typing import Any, Callable, List, Dict, Optional, Set, Tuple
+
+from records import Commit, KudosEdge, MeetingFlow, ReceivedCode, Record, SlackMessage, TranscriptLine
 
 
 def load_json(path: str) -> Dict:
@@ -7,74 +13,426 @@ def load_json(path: str) -> Dict:
         return json.load(f)
 
 
-def get_user_slack_messages(slack_data: Dict, user_id: str) -> List[Dict]:
+# Path of an array element inside a document, e.g. ("channels", "[]", "messages", "[]")
+JsonPath = Tuple[str, ...]
+StreamHandler = Optional[Callable[[Any, Tuple[int, ...]], None]]
+
+
+def _interned_keys(pairs: List[Tuple[str, Any]]) -> Dict:
+    # json.load shares key strings across a whole document; per-record decoding
+    # would otherwise allocate a fresh "user"/"text"/... for every record.
+    return {sys.intern(k): v for k, v in pairs}
+
+
+_decoder = json.JSONDecoder(object_pairs_hook=_interned_keys)
+_WHITESPACE = re.compile(r"[ \t\r\n]*")
+
+
+class _JsonStreamReader:
+    """
+    Minimal pull reader over a text file: whitespace/punctuation stepping plus
+    raw_decode of complete values, holding only a bounded window of the text.
+    """
+
+    def __init__(self, f, chunk_size: int):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, size: int):
+        self.buf = self.buf[self.pos:]
+        self.pos = 0
+        chunk = self.f.read(size)
+        if not chunk:
+            self.eof = True
+        self.buf += chunk
+
+    def peek(self) -> str:
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if self.eof:
+                return ""
+            self._fill(self.chunk_size)
+
+    def take(self, ch: str):
+        if self.peek() != ch:
+            raise json.JSONDecodeError(f"Expecting '{ch}'", self.buf, self.pos)
+        self.pos += 1
+
+    def value(self) -> Any:
+        need = self.chunk_size
+        while True:
+            self.peek()
+            try:
+                obj, end = _decoder.raw_decode(self.buf, self.pos)
+                # A number touching the end of the window may be truncated ("1.5" of "1.5e3")
+                if self.eof or (end < len(self.buf) and self.buf[end] not in "0123456789.eE+-"):
+                    self.pos = end
+                    return obj
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._fill(need)
+            need *= 2
+
+
+def _stream_value(reader: _JsonStreamReader, path: JsonPath, indices: Tuple[int, ...],
+                  handlers: Dict[JsonPath, StreamHandler], prefixes: set, keep: bool) -> Any:
+    ch = reader.peek()
+    if path not in prefixes or ch not in "{[":
+        return reader.value()
+
+    if ch == "{":
+        reader.take("{")
+        obj = {}
+        if reader.peek() == "}":
+            reader.take("}")
+            return obj
+        while True:
+            key = reader.value()
+            reader.take(":")
+            obj[key] = _stream_value(reader, path + (key,), indices, handlers, prefixes, keep)
+            if reader.peek() == ",":
+                reader.take(",")
+                continue
+            reader.take("}")
+            return obj
+
+    reader.take("[")
+    items = []
+    item_path = path + ("[]",)
+    handler = handlers.get(item_path)
+    if reader.peek() == "]":
+        reader.take("]")
+        return items
+    count = 0
+    while True:
+        item_indices = indices + (count,)
+        item = _stream_value(reader, item_path, item_indices, handlers, prefixes, keep)
+        count += 1
+        if keep or handler is None:
+            items.append(item)
+        if handler is not None:
+            handler(item, item_indices)
+        if reader.peek() == ",":
+            reader.take(",")
+            continue
+        reader.take("]")
+        return items
+
+
+def stream_json(path: str, handlers: Dict[JsonPath, StreamHandler], chunk_size: int = 1 << 20,
+                keep: bool = True) -> Any:
+    """
+    Parse a JSON file incrementally. Containers along each handler path are
+    walked element by element and every element at the path is passed to its
+    handler, together with its array indices, as soon as it is parsed.
+    Returns the same document json.load would, without ever holding the
+    whole file text in memory. A None handler streams the path without a callback.
+    The returned document still holds every record; with keep=False elements
+    passed to a handler are dropped once it returns, leaving their arrays
+    empty, so memory is bounded by the largest single element instead.
+    """
+    prefixes = {p[:i] for p in handlers for i in range(len(p))}
+    with open(path, "r", encoding="utf-8") as f:
+        return _stream_value(_JsonStreamReader(f, chunk_size), (), (), handlers, prefixes, keep)
+
+
+class SymbolTable:
+    """
+    Interned identifiers (user, channel, area and meeting ids) for one
+    snapshot. Each distinct string is kept once and numbered; indexes key on
+    the numbers and only translate back to strings at their public methods.
+    """
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.names: List[str] = []
+
+    def intern(self, name: str) -> int:
+        sid = self.ids.get(name)
+        if sid is None:
+            sid = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return sid
+
+    def lookup(self, name: str) -> Optional[int]:
+        return self.ids.get(name)
+
+    def intern_field(self, record, key: str) -> Optional[int]:
+        """
+        Intern record[key] and, for plain dicts, swap in the shared string so
+        repeated ids across records point at one object
+        """
+        value = record.get(key)
+        if value is None:
+            return None
+        sid = self.intern(value)
+        if isinstance(record, dict):
+            record[key] = self.names[sid]
+        return sid
+
+
+class SlackUserIndex:
+    """
+    Inverted index from Slack user id to the positions of their messages,
+    grouped by channel: {user: {channel_pos: [message_pos, ...]}}.
+    Channels appear in the order they occur in the export.
+    """
+
+    def __init__(self, symbols: Optional[SymbolTable] = None):
+        self.symbols = symbols if symbols is not None else SymbolTable()
+        self.positions: Dict[int, Dict[int, List[int]]] = {}
+
+    def add_channel(self, channel_pos: int, channel: Dict):
+        self.symbols.intern_field(channel, "channel_id")
+
+    def add(self, channel_pos: int, message_pos: int, msg: Dict):
+        user = self.symbols.intern_field(msg, "user")
+        if user is None:
+            return
+        self.positions.setdefault(user, {}).setdefault(channel_pos, []).append(message_pos)
+
+    @classmethod
+    def build(cls, slack_data: Dict, symbols: Optional[SymbolTable] = None) -> "SlackUserIndex":
+        index = cls(symbols)
+        for channel_pos, channel in enumerate(slack_data.get("channels", [])):
+            index.add_channel(channel_pos, channel)
+            for message_pos, msg in enumerate(channel.get("messages", [])):
+                index.add(channel_pos, message_pos, msg)
+        return index
+
+    def users(self) -> List[str]:
+        names = self.symbols.names
+        return [names[sid] for sid in self.positions]
+
+    def channels_for(self, user_id: str) -> Dict[int, List[int]]:
+        return self.positions.get(self.symbols.lookup(user_id), {})
+
+
+def get_user_slack_messages(slack_data: Dict, user_id: str,
+                            index: Optional[SlackUserIndex] = None) -> List[SlackMessage]:
     """
     Extract all Slack messages authored by a specific user
     """
     user_messages = []
 
+    if index is not None:
+        channels = slack_data.get("channels", [])
+        for channel_pos, message_positions in index.channels_for(user_id).items():
+            channel = channels[channel_pos]
+            messages = channel["messages"]
+            for message_pos in message_positions:
+                msg = messages[message_pos]
+                user_messages.append(SlackMessage(
+                    channel=channel["channel_id"],
+                    timestamp=msg["ts"],
+                    text=msg["text"],
+                    contains_code=msg.get("contains_code", False)
+                ))
+        return user_messages
+
     for channel in slack_data.get("channels", []):
         for msg in channel.get("messages", []):
             if msg.get("user") == user_id:
-                user_messages.append({
-                    "channel": channel["channel_id"],
-                    "timestamp": msg["ts"],
-                    "text": msg["text"],
-                    "contains_code": msg.get("contains_code", False)
-                })
+                user_messages.append(SlackMessage(
+                    channel=channel["channel_id"],
+                    timestamp=msg["ts"],
+                    text=msg["text"],
+                    contains_code=msg.get("contains_code", False)
+                ))
 
     return user_messages
 
 
-def get_user_github_commits(github_data: Dict, user_id: str) -> List[Dict]:
+def _to_int(value) -> int:
+    # Some exports store counts as strings ("34"); missing or blank counts are 0
+    if isinstance(value, int):
+        return value
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+class CommitStore:
+    """
+    GitHub commits parsed once: numeric fields coerced to int, partitioned by
+    author and kept sorted by date, so per-author lookups and date-range
+    slices are a bisect plus the matching records.
+    """
+
+    def __init__(self, symbols: Optional[SymbolTable] = None):
+        self.symbols = symbols if symbols is not None else SymbolTable()
+        self.by_author: Dict[int, List[Commit]] = {}
+        self.dates: Dict[int, List[str]] = {}
+
+    def add(self, commit: Dict):
+        author = self.symbols.intern_field(commit, "author")
+        self.symbols.intern_field(commit, "area")
+        if author is None:
+            return
+        self.by_author.setdefault(author, []).append(Commit(
+            sha=commit["sha"],
+            date=commit["date"],
+            message=commit["commit_message"],
+            files_changed=_to_int(commit["files_changed"]),
+            lines_added=_to_int(commit["lines_added"]),
+            lines_deleted=_to_int(commit["lines_deleted"]),
+            area=commit["area"],
+            codediff=commit["codediff"]
+        ))
+
+    def finalize(self) -> "CommitStore":
+        # Stable sort keeps export order for commits sharing a timestamp
+        for author, commits in self.by_author.items():
+            commits.sort(key=lambda c: c.date)
+            self.dates[author] = [c.date for c in commits]
+        return self
+
+    @classmethod
+    def build(cls, github_data: Dict, symbols: Optional[SymbolTable] = None) -> "CommitStore":
+        store = cls(symbols)
+        for commit in github_data.get("commits", []):
+            store.add(commit)
+        return store.finalize()
+
+    def authors(self) -> List[str]:
+        names = self.symbols.names
+        return [names[sid] for sid in self.by_author]
+
+    def for_author(self, user_id: str, since: Optional[str] = None, until: Optional[str] = None) -> List[Commit]:
+        """
+        Commits by user_id with since <= date < until (ISO-8601 strings), oldest first
+        """
+        author = self.symbols.lookup(user_id)
+        commits = self.by_author.get(author, [])
+        if not commits or (since is None and until is None):
+            return commits
+        dates = self.dates[author]
+        lo = bisect_left(dates, since) if since is not None else 0
+        hi = bisect_left(dates, until) if until is not None else len(dates)
+        return commits[lo:hi]
+
+
+def get_user_github_commits(github_data: Dict, user_id: str, store: Optional[CommitStore] = None,
+                            since: Optional[str] = None, until: Optional[str] = None) -> List[Commit]:
     """
     Extract all GitHub commits authored by a specific user
     """
+    if store is not None:
+        return store.for_author(user_id, since, until)
+
     return [
-        {
-            "sha": commit["sha"],
-            "date": commit["date"],
-            "message": commit["commit_message"],
-            "files_changed": commit["files_changed"],
-            "lines_added": commit["lines_added"],
-            "lines_deleted": commit["lines_deleted"],
-            "area": commit["area"],
-            "codediff": commit["codediff"]
-        }
+        Commit(
+            sha=commit["sha"],
+            date=commit["date"],
+            message=commit["commit_message"],
+            files_changed=_to_int(commit["files_changed"]),
+            lines_added=_to_int(commit["lines_added"]),
+            lines_deleted=_to_int(commit["lines_deleted"]),
+            area=commit["area"],
+            codediff=commit["codediff"]
+        )
         for commit in github_data.get("commits", [])
         if commit.get("author") == user_id
+        and (since is None or commit["date"] >= since)
+        and (until is None or commit["date"] < until)
     ]
 
 
-def get_user_received_code(slack_data: Dict, user_id: str) -> List[Dict]:
+class MeetingSpeakerIndex:
     """
-    Detect code snippets shared BY OTHERS in conversations involving the user
+    Per-meeting speaker index: {user: {meeting_pos: [line_pos, ...]}},
+    with meetings in transcript order and line positions ascending.
     """
-    received_code = []
 
-    for channel in slack_data.get("channels", []):
-        messages = channel.get("messages", [])
-        for i, msg in enumerate(messages):
-            # Code shared by someone else
-            if msg.get("contains_code") and msg.get("user") != user_id:
-                # Check if user replied after (simple heuristic)
-                for follow_up in messages[i + 1:i + 4]:
-                    if follow_up.get("user") == user_id:
-                        received_code.append({
-                            "channel": channel["channel_id"],
-                            "from_user": msg["user"],
-                            "code_snippet": msg["text"],
-                            "acknowledged_by_user": follow_up["text"]
-                        })
-                        break
-
-    return received_code
+    def __init__(self, symbols: Optional[SymbolTable] = None):
+        self.symbols = symbols if symbols is not None else SymbolTable()
+        self.positions: Dict[int, Dict[int, List[int]]] = {}
+
+    def add_meeting(self, meeting_pos: int, meeting: Dict):
+        self.symbols.intern_field(meeting, "meeting_id")
+
+    def add(self, meeting_pos: int, line_pos: int, line: Dict):
+        user = self.symbols.intern_field(line, "user")
+        if user is None:
+            return
+        self.positions.setdefault(user, {}).setdefault(meeting_pos, []).append(line_pos)
+
+    @classmethod
+    def build(cls, transcripts_data, symbols: Optional[SymbolTable] = None) -> "MeetingSpeakerIndex":
+        index = cls(symbols)
+        for meeting_pos, meeting in enumerate(transcripts_data):
+            index.add_meeting(meeting_pos, meeting)
+            for line_pos, line in enumerate(meeting.get("transcript", [])):
+                index.add(meeting_pos, line_pos, line)
+        return index
+
+    def users(self) -> List[str]:
+        names = self.symbols.names
+        return [names[sid] for sid in self.positions]
+
+    def meetings_for(self, user_id: str) -> Dict[int, List[int]]:
+        return self.positions.get(self.symbols.lookup(user_id), {})
+
+
+def _context_flow(transcript, line_positions: List[int], context_window: int) -> List[TranscriptLine]:
+    # Merge the [pos - w, pos + w] windows around each ascending position into
+    # disjoint runs, so every line is emitted once and in order.
+    flow = []
+    n = len(transcript)
+    run_start = run_end = -1
+    for pos in line_positions:
+        start = max(0, pos - context_window)
+        end = min(n, pos + context_window + 1)
+        if start <= run_end:
+            run_end = max(run_end, end)
+            continue
+        if run_end > run_start:
+            flow.extend(_flow_lines(transcript, run_start, run_end))
+        run_start, run_end = start, end
+    if run_end > run_start:
+        flow.extend(_flow_lines(transcript, run_start, run_end))
+    return flow
+
+
+def _flow_lines(transcript, start: int, end: int) -> List[TranscriptLine]:
+    return [TranscriptLine(line["user"], line["text"]) for line in transcript[start:end]]
+
+
+def get_team_meeting_flows(transcripts_data, context_window=2) -> Dict[str, List[MeetingFlow]]:
+    """
+    Meeting transcript flows with context for every participant at once:
+    {user: [{"meeting_id": ..., "flow": [...]}, ...]}, one pass per meeting.
+    """
+    results: Dict[str, List[MeetingFlow]] = {}
+
+    for meeting in transcripts_data:
+        transcript = meeting.get("transcript", [])
+        speakers: Dict[str, List[int]] = {}
+        for idx, line in enumerate(transcript):
+            user = line.get("user")
+            if user is not None:
+                speakers.setdefault(user, []).append(idx)
+        for user, line_positions in speakers.items():
+            results.setdefault(user, []).append(MeetingFlow(
+                meeting_id=meeting.get("meeting_id"),
+                flow=_context_flow(transcript, line_positions, context_window)
+            ))
+
+    return results
 
 
 def get_user_meeting_transcripts_with_context(
     transcripts_data,
     user_id,
-    context_window=2
+    context_window=2,
+    index: Optional[MeetingSpeakerIndex] = None
 ):
     """
     Extract meeting transcript flows where the user participates,
@@ -82,6 +440,15 @@ def get_user_meeting_transcripts_with_context(
     """
     results = []
 
+    if index is not None:
+        for meeting_pos, line_positions in index.meetings_for(user_id).items():
+            meeting = transcripts_data[meeting_pos]
+            results.append(MeetingFlow(
+                meeting_id=meeting.get("meeting_id"),
+                flow=_context_flow(meeting["transcript"], line_positions, context_window)
+            ))
+        return results
+
     for meeting in transcripts_data:
         meeting_id = meeting.get("meeting_id")
         transcript = meeting.get("transcript", [])
@@ -98,56 +465,181 @@ def get_user_meeting_transcripts_with_context(
         if included_indices:
             flow = []
             for i in sorted(included_indices):
-                flow.append({
-                    "user": transcript[i]["user"],
-                    "text": transcript[i]["text"]
-                })
+                flow.append(TranscriptLine(
+                    user=transcript[i]["user"],
+                    text=transcript[i]["text"]
+                ))
 
-            results.append({
-                "meeting_id": meeting_id,
-                "flow": flow
-            })
+            results.append(MeetingFlow(
+                meeting_id=meeting_id,
+                flow=flow
+            ))
 
     return results
 
 
-def extract_peer_kudos(slack_data, github_data, user_id, context_window=3):
+class AhoCorasick:
     """
-    Detect peer kudos: code shared by user, acknowledged or used by teammates
+    Multi-pattern substring matcher: one pass over a text reports every
+    pattern that occurs anywhere in it.
     """
-    kudos = []
 
-    for channel in slack_data.get("channels", []):
+    def __init__(self, patterns: List[str]):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.out: List[List[int]] = [[]]
+        for pattern_id, pattern in enumerate(patterns):
+            node = 0
+            for ch in pattern:
+                nxt = self.goto[node].get(ch)
+                if nxt is None:
+                    nxt = self.goto[node][ch] = len(self.goto)
+                    self.goto.append({})
+                    self.out.append([])
+                node = nxt
+            self.out[node].append(pattern_id)
+
+        # fail: longest proper suffix that is also a trie node;
+        # link: nearest node along the fail chain that ends a pattern
+        self.fail = [0] * len(self.goto)
+        self.link = [0] * len(self.goto)
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self.goto[node].items():
+                queue.append(nxt)
+                f = self.fail[node]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                if node:
+                    self.fail[nxt] = self.goto[f].get(ch, 0)
+                fail = self.fail[nxt]
+                self.link[nxt] = fail if self.out[fail] else self.link[fail]
+
+    def search(self, text: str) -> Set[int]:
+        """
+        Ids of all patterns occurring in text
+        """
+        goto, fail, out, link = self.goto, self.fail, self.out, self.link
+        found: Set[int] = set()
+        reported: Set[int] = set()
+        node = 0
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            hit = node if out[node] else link[node]
+            # Everything further along an already reported chain was reported too
+            while hit and hit not in reported:
+                reported.add(hit)
+                found.update(out[hit])
+                hit = link[hit]
+        return found
+
+
+class GitHubUsageIndex:
+    """
+    For every code-bearing Slack message, the commits by other authors whose
+    diff or message contains the snippet's first 30 characters:
+    {(channel_pos, message_pos): [commit_pos, ...]} in commit order.
+    Built with one automaton pass per commit for the whole workspace.
+    """
+
+    SNIPPET_PREFIX = 30
+
+    def __init__(self, slack_data: Dict, github_data: Dict):
+        self.matches: Dict[Tuple[int, int], List[int]] = {}
+
+        pattern_ids: Dict[str, int] = {}
+        owners: List[List[Tuple[Tuple[int, int], str]]] = []
+        for channel_pos, channel in enumerate(slack_data.get("channels", [])):
+            for message_pos, msg in enumerate(channel.get("messages", [])):
+                if msg.get("contains_code", False):
+                    prefix = msg["text"][:self.SNIPPET_PREFIX]
+                    pattern_id = pattern_ids.setdefault(prefix, len(pattern_ids))
+                    if pattern_id == len(owners):
+                        owners.append([])
+                    owners[pattern_id].append(((channel_pos, message_pos), msg.get("user")))
+
+        # The empty prefix occurs in every commit and cannot live in the trie
+        always = pattern_ids.pop("", None)
+        automaton = AhoCorasick(list(pattern_ids))
+        ids = list(pattern_ids.values())
+
+        for commit_pos, commit in enumerate(github_data.get("commits", [])):
+            commit_text = commit.get("codediff", "") + " " + commit.get("commit_message", "")
+            found = [ids[i] for i in automaton.search(commit_text)]
+            if always is not None:
+                found.append(always)
+            author = commit.get("author")
+            for pattern_id in found:
+                for key, msg_author in owners[pattern_id]:
+                    if author != msg_author:
+                        self.matches.setdefault(key, []).append(commit_pos)
+
+
+def extract_team_code_relations(slack_data, github_data, usage: Optional[GitHubUsageIndex] = None,
+                                context_window=3, received_window=3) -> Dict[str, Dict[str, List[Record]]]:
+    """
+    Peer kudos and received code for the whole workspace, walking each channel
+    once and looking a few messages ahead of every code snippet. A snippet's
+    author gets a slack_ack kudos edge for each teammate message among the
+    next context_window, plus a github_usage edge for each commit by someone
+    else that contains it (see GitHubUsageIndex). Each teammate replying
+    within the next received_window messages received the code, once per
+    snippet. Returns {"peer_kudos": {user: [...]}, "received_code": {user: [...]}}.
+    """
+    if usage is None:
+        usage = GitHubUsageIndex(slack_data, github_data)
+    commits = github_data.get("commits", [])
+    peer_kudos: Dict[str, List[KudosEdge]] = {}
+    received_code: Dict[str, List[ReceivedCode]] = {}
+
+    for channel_pos, channel in enumerate(slack_data.get("channels", [])):
         messages = channel.get("messages", [])
+        channel_id = channel["channel_id"]
         for idx, msg in enumerate(messages):
-            # Code shared by target user
-            if msg.get("user") == user_id and msg.get("contains_code", False):
-                code_snippet = msg["text"]
-
-                # Check next few messages for acknowledgment by others
-                for follow_up in messages[idx + 1 : idx + 1 + context_window]:
-                    if follow_up["user"] != user_id:
-                        kudos.append({
-                            "from_user": user_id,
-                            "to_user": follow_up["user"],
-                            "channel": channel["channel_id"],
-                            "code_snippet": code_snippet,
-                            "ack_text": follow_up["text"],
-                            "type": "slack_ack"
-                        })
-
-                # Optionally: Check GitHub commits for usage
-                for commit in github_data.get("commits", []):
-                    if commit.get("author") != user_id:
-                        commit_text = commit.get("codediff", "") + " " + commit.get("commit_message", "")
-                        if code_snippet[:30] in commit_text:  # simple heuristic
-                            kudos.append({
-                                "from_user": user_id,
-                                "to_user": commit["author"],
-                                "channel": "github",
-                                "code_snippet": code_snippet,
-                                "commit_sha": commit["sha"],
-                                "type": "github_usage"
-                            })
-
-    return kudos
\ No newline at end of file
+            if not msg.get("contains_code", False):
+                continue
+            author = msg.get("user")
+            code_snippet = msg["text"]
+            window = messages[idx + 1 : idx + 1 + max(context_window, received_window)]
+
+            # Teammates replying shortly after the snippet received it (first reply only)
+            seen = set()
+            for follow_up in window[:received_window]:
+                replier = follow_up.get("user")
+                if replier is None or replier == author or replier in seen:
+                    continue
+                seen.add(replier)
+                received_code.setdefault(replier, []).append(ReceivedCode(
+                    channel=channel_id,
+                    from_user=author,
+                    code_snippet=code_snippet,
+                    acknowledged_by_user=follow_up["text"]
+                ))
+
+            if author is None:
+                continue
+            user_kudos = peer_kudos.setdefault(author, [])
+            for follow_up in window[:context_window]:
+                if follow_up["user"] != author:
+                    user_kudos.append(KudosEdge(
+                        from_user=author,
+                        to_user=follow_up["user"],
+                        channel=channel_id,
+                        code_snippet=code_snippet,
+                        type="slack_ack",
+                        ack_text=follow_up["text"]
+                    ))
+            for commit_pos in usage.matches.get((channel_pos, idx), []):
+                commit = commits[commit_pos]
+                user_kudos.append(KudosEdge(
+                    from_user=author,
+                    to_user=commit["author"],
+                    channel="github",
+                    code_snippet=code_snippet,
+                    type="github_usage",
+                    commit_sha=commit["sha"]
+                ))
+
+    return {"peer_kudos": peer_kudos, "received_code": received_code}
@@ -0,0 +1,125 @@
+import asyncio
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+import httpx
+
+# Hop-by-hop and encoding headers no longer apply to a stored, already decoded body
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive"}
+
+
+class HTTPCache:
+    """
+    Persistent store of GET response bodies with their validators (ETag,
+    Last-Modified). Entries marked immutable are served without revalidation.
+    The least recently used entries are evicted beyond max_entries.
+    """
+
+    def __init__(self, path: str, max_entries: int = 5000):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS http_cache ("
+            " key TEXT PRIMARY KEY, url TEXT NOT NULL, headers TEXT NOT NULL, body BLOB NOT NULL,"
+            " etag TEXT, last_modified TEXT, immutable INTEGER NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS http_cache_last_used ON http_cache (last_used)")
+        self._conn.commit()
+
+    @staticmethod
+    def key(request: httpx.Request) -> str:
+        # Credentials are part of the key so one token never sees another's responses
+        digest = hashlib.sha256()
+        for part in (request.method, str(request.url), request.headers.get("authorization", "")):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT headers, body, etag, last_modified, immutable FROM http_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE http_cache SET last_used = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+        headers, body, etag, last_modified, immutable = row
+        return {"headers": json.loads(headers), "body": body, "etag": etag,
+                "last_modified": last_modified, "immutable": bool(immutable)}
+
+    def put(self, key: str, url: str, headers: Dict[str, str], body: bytes, etag: Optional[str],
+            last_modified: Optional[str], immutable: bool):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO http_cache"
+                " (key, url, headers, body, etag, last_modified, immutable, last_used) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, url, json.dumps(headers), body, etag, last_modified, int(immutable), time.time())
+            )
+            self._conn.execute(
+                "DELETE FROM http_cache WHERE key IN ("
+                " SELECT key FROM http_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+            self._conn.commit()
+
+
+class CachingTransport(httpx.AsyncBaseTransport):
+    """
+    Wraps a transport with an HTTPCache. GET responses carrying an ETag or
+    Last-Modified are stored and later revalidated with If-None-Match /
+    If-Modified-Since; a 304 is answered from the store. URLs matching one
+    of immutable_paths are stored regardless and never requested again.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, cache: HTTPCache,
+                 immutable_paths: Iterable[str] = ()):
+        self.transport = transport
+        self.cache = cache
+        self.immutable_paths = [re.compile(pattern) for pattern in immutable_paths]
+
+    def _immutable(self, request: httpx.Request) -> bool:
+        return any(pattern.search(request.url.path) for pattern in self.immutable_paths)
+
+    @staticmethod
+    def _cached_response(request: httpx.Request, entry: Dict) -> httpx.Response:
+        return httpx.Response(200, headers=entry["headers"], content=entry["body"], request=request)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method != "GET":
+            return await self.transport.handle_async_request(request)
+
+        key = self.cache.key(request)
+        entry = await asyncio.to_thread(self.cache.get, key)
+        if entry is not None and entry["immutable"]:
+            return self._cached_response(request, entry)
+        if entry is not None:
+            if entry["etag"]:
+                request.headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                request.headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = await self.transport.handle_async_request(request)
+        if response.status_code == 304 and entry is not None:
+            await response.aclose()
+            return self._cached_response(request, entry)
+
+        etag = response.headers.get("etag")
+        last_modified = response.headers.get("last-modified")
+        immutable = self._immutable(request)
+        if response.status_code != 200 or not (etag or last_modified or immutable):
+            return response
+
+        body = await response.aread()
+        headers = {name: value for name, value in response.headers.items() if name not in _DROPPED_HEADERS}
+        await asyncio.to_thread(self.cache.put, key, str(request.url), headers, body, etag, last_modified, immutable)
+        return httpx.Response(200, headers=headers, content=body, request=request)
+
+    async def aclose(self):
+        await self.transport.aclose()
@@ -0,0 +1,107 @@
+import asyncio
+import hashlib
+import json
+import os
+import random
+from typing import Dict
+
+
+class LLMBackend:
+    """
+    Something that turns a scoring prompt into JSON text matching a JSON schema.
+    model identifies the backend's outputs, e.g. in score cache keys.
+    """
+    model = ""
+
+    async def generate(self, prompt: str, json_schema: Dict) -> str:
+        raise NotImplementedError
+
+
+class GeminiBackend(LLMBackend):
+    """
+    Google Gemini via the async genai client (reads GEMINI_API_KEY)
+    """
+
+    def __init__(self, model: str = "gemini-2.5-flash-lite"):
+        self.model = model
+        self._client = None
+
+    def client(self):
+        # Created on first use so importing the app doesn't need credentials
+        if self._client is None:
+            from google import genai
+            self._client = genai.Client()
+        return self._client
+
+    async def generate(self, prompt: str, json_schema: Dict) -> str:
+        response = await self.client().aio.models.generate_content(
+            model=self.model,
+            contents=prompt,
+            config={
+                "response_mime_type": "application/json",
+                "response_json_schema": json_schema,
+            }
+        )
+        return response.text
+
+
+def _stub_value(schema: Dict, defs: Dict, seed: bytes, path: str):
+    """
+    A value matching a JSON schema, derived only from seed and the field path
+    """
+    if "$ref" in schema:
+        schema = defs[schema["$ref"].rsplit("/", 1)[-1]]
+    digest = hashlib.sha256(seed + path.encode("utf-8")).digest()
+    kind = schema.get("type")
+    if kind == "object":
+        return {
+            name: _stub_value(prop, defs, seed, f"{path}.{name}")
+            for name, prop in schema.get("properties", {}).items()
+        }
+    if kind == "array":
+        return [_stub_value(schema.get("items", {}), defs, seed, f"{path}[{i}]") for i in range(digest[0] % 3)]
+    if kind == "integer":
+        return digest[0] % 5
+    if kind == "number":
+        return 1 + digest[0] % 41 / 10
+    if kind == "boolean":
+        return digest[0] % 2 == 0
+    return f"stub {path.lstrip('.')} {digest[:4].hex()}"
+
+
+class StubBackend(LLMBackend):
+    """
+    Offline stand-in for benchmarking: sleeps latency +/- jitter seconds, then
+    returns JSON valid for the requested schema whose values depend only on
+    the prompt, so the same prompt always gets the same result.
+    """
+    model = "local-stub"
+
+    def __init__(self, latency: float = 0.5, jitter: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self._random = random.Random(seed)
+
+    async def generate(self, prompt: str, json_schema: Dict) -> str:
+        delay = self.latency + self._random.uniform(-self.jitter, self.jitter)
+        await asyncio.sleep(max(delay, 0.0))
+
+        seed = hashlib.sha256(prompt.encode("utf-8")).digest()
+        return json.dumps(_stub_value(json_schema, json_schema.get("$defs", {}), seed, ""))
+
+
+def make_llm_backend() -> LLMBackend:
+    """
+    Backend chosen by LLM_BACKEND: "gemini" (default, model from LLM_MODEL)
+    or "stub" (latency and jitter from LLM_STUB_LATENCY_MS / LLM_STUB_JITTER_MS)
+    """
+    name = os.getenv("LLM_BACKEND", "gemini").lower()
+    if name == "gemini":
+        return GeminiBackend(os.getenv("LLM_MODEL", "gemini-2.5-flash-lite"))
+    if name == "stub":
+        return StubBackend(
+            latency=float(os.getenv("LLM_STUB_LATENCY_MS", "500")) / 1000,
+            jitter=float(os.getenv("LLM_STUB_JITTER_MS", "0")) / 1000,
+            seed=int(os.getenv("LLM_STUB_SEED", "0"))
+        )
+    raise ValueError(f"Unknown LLM_BACKEND: {name}")
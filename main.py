@@ -1,10 +1,59 @@
-from fastapi import FastAPI, Path, HTTPException
-from google import genai
+from fastapi import FastAPI, Path, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
+from contextlib import asynccontextmanager
+
+import asyncio
+import hashlib
+import os
+from typing import Dict, List, Optional, Tuple
+
+from llm_backends import make_llm_backend
+from prompt_builder import PromptBuilder, estimate_tokens
+from records import MeetingFlow, dump_records
+from score_cache import ScoreCache
+from score_history import ScoreHistoryStore
+from score_jobs import JobStore, JobWorkerPool
+from score_watermarks import ScoreWatermarkStore
+from single_flight import SingleFlight
+from workspace import WorkspaceSnapshot, get_workspace, load_workspace
+
+# Bump whenever the prompt wording or evidence layout changes so cached scores miss
+PROMPT_TEMPLATE_VERSION = "3"
+# Upper bound on the evidence section of the scoring prompt, in estimated tokens
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "24000"))
+# Score difficulty, kudos and penalties as three concurrent LLM calls instead of one
+SCORE_SECTIONED = os.getenv("SCORE_SECTIONED", "false").lower() in ("1", "true", "yes")
+
+score_cache = ScoreCache(
+    os.getenv("SCORE_CACHE_PATH", "score_cache.db"),
+    max_entries=int(os.getenv("SCORE_CACHE_MAX_ENTRIES", "1000")),
+    ttl_seconds=float(os.getenv("SCORE_CACHE_TTL_SECONDS", str(24 * 3600)))
+)
+score_watermarks = ScoreWatermarkStore(os.getenv("SCORE_STATE_PATH", "score_state.db"))
+score_history = ScoreHistoryStore(os.getenv("SCORE_HISTORY_PATH", "score_history.db"))
+
+# Shared by every scoring request in this process; LLM_BACKEND=stub scores offline
+llm_backend = make_llm_backend()
+llm_semaphore = asyncio.Semaphore(int(os.getenv("LLM_MAX_CONCURRENCY", "4")))
+scoring_flights = SingleFlight()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Parse the workspace sources once up front so the first request doesn't pay for it
+    try:
+        await load_workspace()
+    except FileNotFoundError as e:
+        print(f"Workspace data not loaded at startup: {e}")
+    job_workers.start()
+    yield
+    await job_workers.stop()
+
 
-app = FastAPI(title="WorkScore Calculator API")
+app = FastAPI(title="WorkScore Calculator API", lifespan=lifespan)
 
 # You can add additional URLs to this list, for example, the frontend's production domain, or other frontends.
 allowed_origins = [
@@ -39,15 +88,17 @@ async def get_user_full_data(user_id: str = Path(..., description="The ID/userna
     Returns all raw activity data for a specific user across all platforms.
     """
     try:
-        # 1. Load the raw data sources
-        slack_data = load_json("slack_data.json")
-        github_data = load_json("github_commits.json")
-        transcripts_data = load_json("meeting.json")
+        # 1. Read the raw data sources from the resident snapshot
+        workspace = await load_workspace()
+        slack_data = workspace.slack_data
+        github_data = workspace.github_data
+        transcripts_data = workspace.transcripts_data
 
         # 2. Extract user-specific records using your helper functions
-        user_slack = get_user_slack_messages(slack_data, user_id)
-        user_github = get_user_github_commits(github_data, user_id)
-        user_meetings = get_user_meeting_transcripts_with_context(transcripts_data, user_id)
+        user_slack = get_user_slack_messages(slack_data, user_id, index=workspace.slack_index)
+        user_github = get_user_github_commits(github_data, user_id, store=workspace.commit_store)
+        user_meetings = get_user_meeting_transcripts_with_context(transcripts_data, user_id,
+                                                                  index=workspace.meeting_index)
 
         # 3. Check if the user actually has any data
         if not user_slack and not user_github and not user_meetings:
@@ -62,9 +113,9 @@ async def get_user_full_data(user_id: str = Path(..., description="The ID/userna
                 "meetings_attended": len(user_meetings)
             },
             "raw_data": {
-                "slack": user_slack,
-                "github": user_github,
-                "meetings": user_meetings
+                "slack": dump_records(user_slack),
+                "github": dump_records(user_github),
+                "meetings": dump_records(user_meetings)
             }
         }
 
@@ -76,25 +127,16 @@ async def get_user_full_data(user_id: str = Path(..., description="The ID/userna
 def get_all_registered_users() -> List[str]:
     """Extracts the predefined user list from the workspace JSON."""
     try:
-        with open("slack_data.json", "r", encoding='utf-8') as f:
-            data = json.load(f)
-            # Accessing the "users" key directly from your JSON structure
-            return data.get("users", [])
+        # Accessing the "users" key directly from your JSON structure
+        return get_workspace().slack_data.get("users", [])
     except (FileNotFoundError, json.JSONDecodeError):
         return []
 
 
 def discover_active_users() -> List[str]:
-    """Scans channels to find users who actually sent messages."""
-    active_users = set()
+    """Finds users who actually sent messages, via the snapshot's Slack index."""
     try:
-        with open("slack_data.json", "r",encoding='utf-8') as f:
-            data = json.load(f)
-            for channel in data.get("channels", []):
-                for msg in channel.get("messages", []):
-                    if "user" in msg:
-                        active_users.add(msg["user"])
-        return list(active_users)
+        return get_workspace().slack_index.users()
     except Exception:
         return []
 
@@ -105,10 +147,11 @@ async def list_users(discovery: bool = False):
     Returns the list of users.
     Use ?discovery=true to scan message history for active users.
     """
+    # Either may reload the workspace, which must not block the event loop
     if discovery:
-        users = discover_active_users()
+        users = await asyncio.to_thread(discover_active_users)
     else:
-        users = get_all_registered_users()
+        users = await asyncio.to_thread(get_all_registered_users)
 
     if not users:
         raise HTTPException(status_code=404, detail="No users found in data source.")
@@ -116,6 +159,23 @@ async def list_users(discovery: bool = False):
     return sorted(users)
 
 
+@app.get("/team/code-relations")
+async def get_team_code_relations():
+    """
+    Returns peer kudos and received-code edges for every user, keyed by user.
+    """
+    try:
+        workspace = await load_workspace()
+        # Computed on first access per snapshot, so also kept off the event loop
+        relations = await asyncio.to_thread(lambda: workspace.code_relations)
+        return {
+            kind: {user: dump_records(edges) for user, edges in by_user.items()}
+            for kind, by_user in relations.items()
+        }
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=500, detail=f"Data file missing: {str(e)}")
+
+
 # Your existing POST /calculate-score/{user_id} goes here...
 # Exact schema from your JSON
 class AnalysisSummary(BaseModel):
@@ -132,62 +192,171 @@ class Variables(BaseModel):
 class ResponseSchema(BaseModel):
     analysis_summary: AnalysisSummary
     variables: Variables
-@app.post("/calculate-score/{user_id}", response_model=ResponseSchema)
-async def get_work_score(user_id: str = Path(..., description="The GitHub/Slack username")):
-    try:
-        slack_data = load_json("slack_data.json")
-        github_data = load_json("github_commits.json")
-        transcripts_data = load_json("meeting.json")
 
-        slack_messages = get_user_slack_messages(slack_data, user_id)
-        github_commits = get_user_github_commits(github_data, user_id)
-        received_code = get_user_received_code(slack_data, user_id)
+
+class PromptMetadata(BaseModel):
+    budget_tokens: int
+    evidence_chars: int
+    evidence_tokens: int
+    prompt_chars: int
+    prompt_tokens: int = Field(description="Estimated tokens sent to the LLM")
+    section_tokens: Dict[str, int]
+    truncated_items: int = Field(description="Transcripts cut down to fit the budget")
+    dropped_items: int = Field(description="Items omitted entirely to fit the budget")
+    over_budget: bool = Field(False, description="Evidence still exceeds the budget after every cut")
+    mode: str = Field("full", description="full, delta (only new evidence sent) or unchanged (no LLM call)")
+    llm_calls: int = Field(1, description="Prompts sent per scoring; one per section in sectioned mode")
+
+
+class ScoreResponse(ResponseSchema):
+    metadata: PromptMetadata
+
+
+def gather_evidence(workspace: WorkspaceSnapshot, user_id: str,
+                    meeting_flows: Optional[List[MeetingFlow]] = None) -> Dict[str, list]:
+    """
+    Collect a user's scoring evidence from the snapshot's indexes.
+    Batch scoring passes meeting_flows precomputed for the whole team.
+    """
+    if meeting_flows is None:
         meeting_flows = get_user_meeting_transcripts_with_context(
-            transcripts_data,
+            workspace.transcripts_data,
             user_id,
-            context_window=2
+            context_window=2,
+            index=workspace.meeting_index
         )
+    return {
+        "slack": get_user_slack_messages(workspace.slack_data, user_id, index=workspace.slack_index),
+        "commits": get_user_github_commits(workspace.github_data, user_id, store=workspace.commit_store),
+        "received_code": workspace.code_relations["received_code"].get(user_id, []),
+        "meetings": meeting_flows,
+        "peer_kudos": workspace.code_relations["peer_kudos"].get(user_id, []),
+    }
+
+
+def _record_digest(record) -> str:
+    return hashlib.sha1(json.dumps(record.to_dict(), sort_keys=True).encode("utf-8")).hexdigest()[:16]
 
-        peer_kudos = extract_peer_kudos(slack_data, github_data, user_id)
+
+def evidence_watermark(evidence: Dict[str, list]) -> Dict:
+    """
+    Which evidence has been scored: commits by SHA, and Slack messages and
+    code-relation edges by digest, so records sharing or predating another's
+    timestamp (e.g. rebased commits) are still recognised as new. Meetings
+    are tracked by the last one seen.
+    """
+    return {
+        "slack": sorted(_record_digest(m) for m in evidence["slack"]),
+        "commits": sorted(c.sha for c in evidence["commits"]),
+        "meeting_id": evidence["meetings"][-1].meeting_id if evidence["meetings"] else None,
+        "edges": sorted(_record_digest(e) for e in evidence["received_code"] + evidence["peer_kudos"]),
+    }
 
 
-        # Client reads GEMINI_API_KEY env var
-        client = genai.Client()
-        SOURCE = ''
-        SOURCE += "\n🔹 Slack Messages"
-        for m in slack_messages:
-            SOURCE += str(m)
+def evidence_since(evidence: Dict[str, list], watermark: Dict) -> Optional[Dict[str, list]]:
+    """
+    The part of evidence not covered by watermark, or None if the watermark
+    no longer lines up with the data (e.g. its meeting disappeared) and a
+    full rescore is needed.
+    """
+    meetings = evidence["meetings"]
+    if watermark["meeting_id"] is not None:
+        ids = [meeting.meeting_id for meeting in meetings]
+        if watermark["meeting_id"] not in ids:
+            return None
+        meetings = meetings[ids.index(watermark["meeting_id"]) + 1:]
+
+    seen_slack, seen_commits, seen_edges = set(watermark["slack"]), set(watermark["commits"]), set(watermark["edges"])
+    return {
+        "slack": [m for m in evidence["slack"] if _record_digest(m) not in seen_slack],
+        "commits": [c for c in evidence["commits"] if c.sha not in seen_commits],
+        "received_code": [r for r in evidence["received_code"] if _record_digest(r) not in seen_edges],
+        "meetings": meetings,
+        "peer_kudos": [k for k in evidence["peer_kudos"] if _record_digest(k) not in seen_edges],
+    }
+
+
+# Once transcripts are dropped, whole items go in this order to meet the
+# budget: Slack messages (oldest first), received code, commits (oldest
+# first) and finally peer kudos
+def _add_slack(builder: PromptBuilder, evidence: Dict[str, list]):
+    builder.section("\n🔹 Slack Messages")
+    for m in evidence["slack"]:
+        builder.add(str(m.to_dict()), drop_key=(0, m.timestamp))
+
+
+def _add_commits(builder: PromptBuilder, evidence: Dict[str, list]):
+    builder.section("\n🔹 GitHub Commits")
+    for c in evidence["commits"]:
+        builder.add(f"{c.sha, '-', c.message}", drop_key=(2, c.date))
+
+
+def _add_received_code(builder: PromptBuilder, evidence: Dict[str, list]):
+    builder.section("\n🔹 Code Received from Teammates")
+    for i, r in enumerate(evidence["received_code"]):
+        builder.add(str(r.to_dict()), drop_key=(1, i))
+
+
+def _add_meetings(builder: PromptBuilder, evidence: Dict[str, list]):
+    builder.section("\n🔹 Meeting Transcript Flow")
+    for meeting in evidence["meetings"]:
+        builder.add(f"\nMeeting {meeting.meeting_id}")
+        builder.add("".join(f"{line.user}: {line.text}" for line in meeting.flow), truncatable=True)
+
+
+def _add_peer_kudos(builder: PromptBuilder, evidence: Dict[str, list]):
+    builder.section("\n🔹 Peer Kudos")
+    for i, k in enumerate(evidence["peer_kudos"]):
+        if k.type == "slack_ack":
+            builder.add(f"{k.from_user} shared code -> acknowledged by {k.to_user} in Slack: {k.ack_text}",
+                        drop_key=(3, i))
+        else:
+            builder.add(f"{k.from_user} shared code -> used by {k.to_user} in GitHub commit {k.commit_sha}",
+                        drop_key=(3, i))
+
+
+DELTA_NOTE = """
+        Incremental Run: The Input Data contains ONLY evidence that is new since the Previous Score, which is given for context. Score the new evidence on its own: count only new kudos and new penalties, rate difficulty from the new commits only, and cite only new quotes.
+        """
 
-        SOURCE += "\n🔹 GitHub Commits"
-        for c in github_commits:
-            SOURCE += f"{c['sha'], '-', c['message']}"
 
-        SOURCE += "\n🔹 Code Received from Teammates"
-        for r in received_code:
-            SOURCE += str(r)
+def _start_prompt(previous: Optional[ResponseSchema]) -> PromptBuilder:
+    builder = PromptBuilder()
+    if previous is not None:
+        builder.section("\n🔹 Previous Score")
+        builder.add(previous.model_dump_json())
+    return builder
 
-        SOURCE += "\n🔹 Meeting Transcript Flow"
-        for meeting in meeting_flows:
-            SOURCE += f"\nMeeting {meeting['meeting_id']}"
-            for line in meeting["flow"]:
-                SOURCE += f"{line['user']}: {line['text']}"
 
-        SOURCE += "\n🔹 Peer Kudos"
-        for k in peer_kudos:
-            if k["type"] == "slack_ack":
-                SOURCE += f"{k['from_user']} shared code -> acknowledged by {k['to_user']} in Slack: {k['ack_text']}"
-            else:
-                SOURCE += f"{k['from_user']} shared code -> used by {k['to_user']} in GitHub commit {k['commit_sha']}"
+def build_score_prompt(evidence: Dict[str, list],
+                       previous: Optional[ResponseSchema] = None) -> Tuple[str, str, PromptMetadata]:
+    """
+    Assemble the scoring evidence and the full LLM prompt, keeping the
+    evidence within PROMPT_TOKEN_BUDGET by truncating the largest transcripts
+    first, then dropping whole items (see _add_slack). With a previous result,
+    the evidence is only what is new since then and the previous result is
+    included as context.
+    Returns (evidence, prompt, metadata).
+    """
+    builder = _start_prompt(previous)
+    _add_slack(builder, evidence)
+    _add_commits(builder, evidence)
+    _add_received_code(builder, evidence)
+    _add_meetings(builder, evidence)
+    _add_peer_kudos(builder, evidence)
 
+    SOURCE, stats = builder.build(PROMPT_TOKEN_BUDGET)
 
-        prompt = f"""**Instruction:** You are a data processing engine. Analyze the provided GitHub Diffs, Slack Messages, and Meeting Transcripts to calculate a `WorkScore`.
+    delta_note = DELTA_NOTE if previous is not None else ""
+
+    prompt = f"""**Instruction:** You are a data processing engine. Analyze the provided GitHub Diffs, Slack Messages, and Meeting Transcripts to calculate a `WorkScore`.
         Your goal is absolute, mathematical accuracy.
         Rules of Engagement:
         1. Zero-Shot Error Tolerance: You have zero tolerance for hallucination or approximation. If data is ambiguous, state the ambiguity rather than guessing.
         2. Recursive Verification: Before outputting a final response, you must draft three internal solutions. Compare them, check for logical fallacies, and only output the version that survives rigorous cross-examination.
         3. SOTA Standard: Operate at a level that exceeds the capabilities of standard models (GPT-4/Gemini Ultra). Your reasoning must be granular, step-by-step, and irrefutable.
         4. Citation & Logic: Every assertion must be backed by verifiable logic or data.
-        **Input Data:**
+        {delta_note}**Input Data:**
         
         {SOURCE}
         
@@ -201,31 +370,350 @@ async def get_work_score(user_id: str = Path(..., description="The GitHub/Slack
         **Constraint:** Return **ONLY** a valid JSON object. Do not include introductory text or markdown explanations.
     
         """
-        print(prompt)
-        response = client.models.generate_content(
-            model="gemini-2.5-flash-lite",
-            contents=prompt,
-            config={
-                "response_mime_type": "application/json",
-                "response_json_schema": ResponseSchema.model_json_schema(),
-            }
+    stats["prompt_chars"] = len(prompt)
+    stats["prompt_tokens"] = estimate_tokens(prompt)
+    return SOURCE, prompt, PromptMetadata(**stats, mode="delta" if previous is not None else "full")
+
+
+class DifficultySection(BaseModel):
+    difficulty_rationale: str = Field(description="Rationale for difficulty level")
+    difficulty_factor: float = Field(description="Difficulty 1 to 5")
+
+
+class KudosSection(BaseModel):
+    kudos_evidence: List[str] = Field(description="List of quotes supporting kudos")
+    peer_kudos_count: int = Field(description="Number of peer kudos")
+
+
+class PenaltySection(BaseModel):
+    penalty_evidence: List[str] = Field(description="List of incidents for penalties")
+    blocker_penalty_total: int = Field(description="Total penalty from blockers")
+
+
+# Each section scores one ResponseSchema component from only the evidence it needs
+SCORE_SECTIONS = {
+    "difficulty": (
+        DifficultySection, (_add_commits,),
+        "Difficulty 1 to 5: Based on Github Commits and codediff changes. Explain the rating in difficulty_rationale."
+    ),
+    "kudos": (
+        KudosSection, (_add_slack, _add_received_code, _add_peer_kudos),
+        'PeerKudos (Count): Total count of unique instances of peer appreciation or public "thank-yous." '
+        "Quote each instance in kudos_evidence."
+    ),
+    "penalties": (
+        PenaltySection, (_add_meetings,),
+        "BlockerPenalty (Flat Sum): Deduct 10 points for every instance where the user explicitly blocked "
+        "progress, missed a deadline, or broke a build. Describe each incident in penalty_evidence."
+    ),
+}
+
+
+def build_section_prompts(evidence: Dict[str, list],
+                          previous: Optional[ResponseSchema] = None) -> Tuple[str, Dict[str, str], PromptMetadata]:
+    """
+    Like build_score_prompt, but one smaller prompt per SCORE_SECTIONS entry,
+    each with its own evidence and token budget. Returns (evidence, {section:
+    prompt}, metadata), where evidence covers all sections for cache keys.
+    """
+    sources, prompts, totals = [], {}, {}
+    delta_note = DELTA_NOTE if previous is not None else ""
+    for name, (_, add_evidence, logic) in SCORE_SECTIONS.items():
+        builder = _start_prompt(previous)
+        for add in add_evidence:
+            add(builder, evidence)
+        source, stats = builder.build(PROMPT_TOKEN_BUDGET)
+        prompts[name] = f"""**Instruction:** You are a data processing engine. Analyze the provided evidence to calculate one component of a `WorkScore`.
+        Your goal is absolute, mathematical accuracy. If data is ambiguous, state the ambiguity rather than guessing. Every assertion must be backed by verifiable logic or data.
+        {delta_note}**Input Data:**
+        
+        {source}
+        
+        Calculation Logic:
+        
+        {logic}
+        
+        **Constraint:** Return **ONLY** a valid JSON object. Do not include introductory text or markdown explanations.
+        """
+        sources.append(f"[{name}]{source}")
+        stats["prompt_chars"] = len(prompts[name])
+        stats["prompt_tokens"] = estimate_tokens(prompts[name])
+        for key, value in stats.items():
+            if key == "section_tokens":
+                totals.setdefault(key, {}).update({f"{name}/{k}": v for k, v in value.items()})
+            elif key == "over_budget":
+                totals[key] = totals.get(key, False) or value
+            elif key != "budget_tokens":
+                totals[key] = totals.get(key, 0) + value
+    metadata = PromptMetadata(**totals, budget_tokens=PROMPT_TOKEN_BUDGET, llm_calls=len(prompts),
+                              mode="delta" if previous is not None else "full")
+    return "".join(sources), prompts, metadata
+
+
+async def generate_score(prompt: str, schema=ResponseSchema):
+    """
+    Run a scoring prompt through the configured LLM backend without
+    blocking the event loop and validate it against schema. At most
+    LLM_MAX_CONCURRENCY calls are in flight per process.
+    """
+    async with llm_semaphore:
+        text = await llm_backend.generate(prompt, schema.model_json_schema())
+    return schema.model_validate_json(text)
+
+
+async def generate_sectioned_score(prompts: Dict[str, str]) -> ResponseSchema:
+    """
+    Run the section prompts concurrently, so latency is that of the slowest
+    section, and merge their answers into one ResponseSchema.
+    """
+    names = list(prompts)
+    parts = await asyncio.gather(*(generate_score(prompts[name], SCORE_SECTIONS[name][0]) for name in names))
+    sections = dict(zip(names, parts))
+    return ResponseSchema(
+        analysis_summary=AnalysisSummary(
+            difficulty_rationale=sections["difficulty"].difficulty_rationale,
+            kudos_evidence=sections["kudos"].kudos_evidence,
+            penalty_evidence=sections["penalties"].penalty_evidence
+        ),
+        variables=Variables(
+            base_points=10,
+            difficulty_factor=sections["difficulty"].difficulty_factor,
+            peer_kudos_count=sections["kudos"].peer_kudos_count,
+            blocker_penalty_total=sections["penalties"].blocker_penalty_total
         )
+    )
+
+
+def _merge_evidence(previous: List[str], new: List[str]) -> List[str]:
+    return previous + [item for item in new if item not in previous]
+
 
-        # Parse and save to file
-        data = ResponseSchema.model_validate_json(response.text)
-        with open('score_response.json', 'w') as f:
-            json.dump(data.model_dump(), f, indent=2)
+def merge_scores(previous: ResponseSchema, delta: ResponseSchema,
+                 previous_commits: int, new_commits: int) -> ResponseSchema:
+    """
+    Fold a score of only-new evidence into the previous result. Counts and
+    penalties add up, difficulty is averaged weighted by commit count, and
+    quotes are appended without duplicates, so the same inputs always merge
+    to the same result.
+    """
+    total_commits = previous_commits + new_commits
+    if new_commits and total_commits:
+        difficulty = round((previous.variables.difficulty_factor * previous_commits
+                            + delta.variables.difficulty_factor * new_commits) / total_commits, 2)
+        rationale = delta.analysis_summary.difficulty_rationale
+    else:
+        difficulty = previous.variables.difficulty_factor
+        rationale = previous.analysis_summary.difficulty_rationale
+    return ResponseSchema(
+        analysis_summary=AnalysisSummary(
+            difficulty_rationale=rationale,
+            kudos_evidence=_merge_evidence(previous.analysis_summary.kudos_evidence,
+                                           delta.analysis_summary.kudos_evidence),
+            penalty_evidence=_merge_evidence(previous.analysis_summary.penalty_evidence,
+                                             delta.analysis_summary.penalty_evidence)
+        ),
+        variables=Variables(
+            base_points=previous.variables.base_points,
+            difficulty_factor=difficulty,
+            peer_kudos_count=previous.variables.peer_kudos_count + delta.variables.peer_kudos_count,
+            blocker_penalty_total=previous.variables.blocker_penalty_total + delta.variables.blocker_penalty_total
+        )
+    )
 
-        print("Saved to score_response.json")
-        print(json.dumps(data.model_dump(), indent=2))
-        result = ResponseSchema.model_validate_json(response.text)
-        # result.user_id = user_id  # Ensure the ID matches the request
-        return result
 
+def _plan_scoring(workspace: WorkspaceSnapshot, user_id: str, full_rescore: bool,
+                  meeting_flows: Optional[List[MeetingFlow]], bypass_cache: bool = False):
+    """
+    Gather the user's evidence and decide between a full and a delta run.
+    With bypass_cache and nothing new since the stored score, there is no
+    delta to send, so the run falls back to a full rescore.
+    Returns (watermark, previous, new_evidence, SOURCE, prompt, metadata);
+    previous is None for a full run, and prompt is a {section: prompt} dict
+    in sectioned mode.
+    """
+    evidence = gather_evidence(workspace, user_id, meeting_flows)
+    watermark = evidence_watermark(evidence)
+    state = None if full_rescore else score_watermarks.get(user_id, llm_backend.model, PROMPT_TEMPLATE_VERSION)
+    new_evidence = evidence_since(evidence, state["watermark"]) if state is not None else None
+    if bypass_cache and new_evidence is not None and not any(new_evidence.values()):
+        new_evidence = None
+    build = build_section_prompts if SCORE_SECTIONED else build_score_prompt
+    if new_evidence is None:
+        return (watermark, None, evidence) + build(evidence)
+    previous = ResponseSchema.model_validate_json(state["result"])
+    return (watermark, previous, new_evidence) + build(new_evidence, previous)
+
+
+async def score_user(workspace: WorkspaceSnapshot, user_id: str, bypass_cache: bool = False,
+                     meeting_flows: Optional[List[MeetingFlow]] = None, full_rescore: bool = False) -> ScoreResponse:
+    """
+    Score one user. If the user was scored before, only the evidence newer
+    than the stored watermark goes to the LLM and the result is merged into
+    the previous score; full_rescore sends the whole history instead.
+    Prompts with unchanged evidence are served from the score cache, and
+    concurrent calls with the same evidence share one in-flight computation.
+    bypass_cache always makes a fresh LLM call.
+    """
+    # Evidence extraction is CPU-bound; keep it off the event loop
+    watermark, previous, new_evidence, SOURCE, prompt, metadata = await asyncio.to_thread(
+        _plan_scoring, workspace, user_id, full_rescore, meeting_flows, bypass_cache
+    )
+
+    if previous is not None and not any(new_evidence.values()):
+        metadata.mode = "unchanged"
+        return ScoreResponse(**previous.model_dump(), metadata=metadata)
+
+    # Identical evidence under the same prompt template and model scores the same
+    cache_key = ScoreCache.key(SOURCE, PROMPT_TEMPLATE_VERSION, llm_backend.model)
+
+    async def compute() -> ResponseSchema:
+        data = None
+        if not bypass_cache:
+            cached = await asyncio.to_thread(score_cache.get, cache_key)
+            if cached is not None:
+                data = ResponseSchema.model_validate_json(cached)
+
+        if data is None:
+            print(prompt)
+            if isinstance(prompt, dict):
+                data = await generate_sectioned_score(prompt)
+            else:
+                data = await generate_score(prompt)
+            await asyncio.to_thread(score_cache.put, cache_key, data.model_dump_json())
+            print(json.dumps(data.model_dump(), indent=2))
+
+        if previous is not None:
+            data = merge_scores(previous, data, len(watermark["commits"]) - len(new_evidence["commits"]),
+                                len(new_evidence["commits"]))
+        await asyncio.to_thread(score_watermarks.put, user_id, llm_backend.model, PROMPT_TEMPLATE_VERSION,
+                                watermark, data.model_dump_json())
+        await asyncio.to_thread(score_history.append, user_id, llm_backend.model,
+                                ScoreResponse(**data.model_dump(), metadata=metadata).model_dump_json())
+        return data
+
+    # Concurrent requests for the same user and evidence share one computation
+    data = await scoring_flights.run((user_id, cache_key, bypass_cache), compute)
+    return ScoreResponse(**data.model_dump(), metadata=metadata)
+
+
+async def run_score_job(user_id: str, params: Dict) -> str:
+    workspace = await load_workspace()
+    result = await score_user(workspace, user_id, params["bypass_cache"], full_rescore=params["full_rescore"])
+    return result.model_dump_json()
+
+
+score_jobs = JobStore(os.getenv("SCORE_JOB_PATH", "score_jobs.db"),
+                      lease_seconds=float(os.getenv("SCORE_JOB_LEASE_SECONDS", "60")))
+job_workers = JobWorkerPool(score_jobs, run_score_job, workers=int(os.getenv("SCORE_JOB_WORKERS", "2")))
+
+
+@app.post("/calculate-score/{user_id}", response_model=ScoreResponse)
+async def get_work_score(user_id: str = Path(..., description="The GitHub/Slack username"),
+                         bypass_cache: bool = False, full_rescore: bool = False,
+                         run_async: bool = Query(False, alias="async",
+                                                 description="Queue the scoring and return a job id to poll"),
+                         priority: int = Query(0, description="Higher-priority jobs run first")):
+    if run_async:
+        params = {"bypass_cache": bypass_cache, "full_rescore": full_rescore}
+        job_id = await asyncio.to_thread(score_jobs.enqueue, user_id, params, priority)
+        job_workers.notify()
+        return JSONResponse(status_code=202, content={"job_id": job_id, "status": "queued"})
+    try:
+        return await score_user(await load_workspace(), user_id, bypass_cache, full_rescore=full_rescore)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+class BatchScoreRequest(BaseModel):
+    user_ids: Optional[List[str]] = Field(None, description="Users to score; all registered users if omitted")
+    concurrency: int = Field(4, ge=1, le=64, description="Users scored at once for this batch")
+    bypass_cache: bool = False
+    full_rescore: bool = Field(False, description="Rescore whole histories instead of only new evidence")
+
+
+@app.post("/calculate-score:batch")
+async def batch_work_score(request: BatchScoreRequest):
+    """
+    Scores many users concurrently and streams one NDJSON line per user as
+    soon as its result is ready: {"user_id", "result"} or {"user_id", "error"}.
+    """
+    try:
+        workspace = await load_workspace()
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=500, detail=f"Data file missing: {str(e)}")
+    user_ids = request.user_ids if request.user_ids is not None else workspace.slack_data.get("users", [])
+    batch_limit = asyncio.Semaphore(request.concurrency)
+
+    async def score_one(user_id: str, team_flows: Dict[str, List[MeetingFlow]]) -> Dict:
+        async with batch_limit:
+            try:
+                result = await score_user(workspace, user_id, request.bypass_cache,
+                                          meeting_flows=team_flows.get(user_id, []),
+                                          full_rescore=request.full_rescore)
+                return {"user_id": user_id, "result": result.model_dump()}
+            except Exception as e:
+                return {"user_id": user_id, "error": str(e)}
+
+    async def stream():
+        # Meeting flows for the whole team come from one pass over the transcripts;
+        # Slack, commit and kudos evidence are served from the snapshot's indexes.
+        team_flows = await asyncio.to_thread(get_team_meeting_flows, workspace.transcripts_data, 2)
+        tasks = [asyncio.create_task(score_one(user_id, team_flows)) for user_id in user_ids]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                yield json.dumps(await finished) + "\n"
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+@app.get("/scores/{user_id}")
+async def get_latest_score(user_id: str = Path(..., description="The GitHub/Slack username")):
+    """
+    The most recent stored score for a user from the configured LLM backend,
+    without calling the LLM.
+    """
+    entry = await asyncio.to_thread(score_history.latest, user_id, llm_backend.model)
+    if entry is None:
+        raise HTTPException(status_code=404, detail=f"No score recorded for user: {user_id}")
+    return {"user_id": user_id, **entry}
+
+
+@app.get("/scores/{user_id}/history")
+async def get_score_history(user_id: str = Path(..., description="The GitHub/Slack username"),
+                            limit: int = Query(50, ge=1, le=1000),
+                            since: Optional[float] = Query(None, description="Unix time, inclusive"),
+                            until: Optional[float] = Query(None, description="Unix time, exclusive")):
+    """
+    Stored scores for a user from the configured LLM backend, newest first.
+    """
+    entries = await asyncio.to_thread(score_history.history, user_id, llm_backend.model, limit, since, until)
+    return {"user_id": user_id, "scores": entries}
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """
+    Status of a queued scoring job; result holds the score once status is "done".
+    """
+    job = await asyncio.to_thread(score_jobs.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"No such job: {job_id}")
+    return {
+        "job_id": job["id"],
+        "user_id": job["user_id"],
+        "status": job["status"],
+        "priority": job["priority"],
+        "created_at": job["created_at"],
+        "started_at": job["started_at"],
+        "finished_at": job["finished_at"],
+        "result": job["result"],
+        "error": job["error"],
+    }
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="localhost", port=8000)
\ No newline at end of file
@@ -0,0 +1,146 @@
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+# Rough chars-per-token ratio for English text and code; good enough for budgeting
+CHARS_PER_TOKEN = 4
+TRUNCATION_MARKER = " …[truncated {} chars]"
+OMISSION_MARKER = "\n…[omitted {} items]"
+# Room kept for the marker on every truncated item or section with omitted items
+MARKER_RESERVE = len(TRUNCATION_MARKER) + 8
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+class PromptBuilder:
+    """
+    Collects prompt evidence as sections of items and renders them with a
+    single join. Items added as truncatable (diffs, transcripts) are cut
+    down, largest first, until the whole evidence fits the token budget.
+    If even dropping those entirely is not enough, items added with a
+    drop_key are omitted, lowest key first, and each section notes how many
+    it lost. Anything else is always kept verbatim, so the budget can still
+    be exceeded; build() reports that as over_budget.
+    """
+
+    def __init__(self):
+        # Each part is [text, truncatable, drop_key, section]; section headers are fixed parts
+        self._parts: List[list] = []
+        self._sections: List[Tuple[str, int, int]] = []
+
+    def section(self, header: str):
+        self._close_section()
+        self._sections.append((header, len(self._parts), len(self._parts)))
+        self._parts.append([header, False, None, len(self._sections) - 1])
+
+    def add(self, text: str, truncatable: bool = False, drop_key: Optional[Any] = None):
+        self._parts.append([text, truncatable, drop_key, len(self._sections) - 1])
+
+    def _close_section(self):
+        if self._sections:
+            header, start, _ = self._sections[-1]
+            self._sections[-1] = (header, start, len(self._parts))
+
+    def build(self, budget_tokens: int) -> Tuple[str, Dict]:
+        """
+        Render the evidence within budget_tokens.
+        Returns (text, stats) where stats carries per-section token estimates,
+        how many items were truncated or dropped and whether the evidence is
+        still over budget.
+        """
+        self._close_section()
+        budget_chars = budget_tokens * CHARS_PER_TOKEN
+        total = sum(len(text) for text, _, _, _ in self._parts)
+
+        cap = None
+        omitted = set()
+        if total > budget_chars:
+            cap = self._truncation_cap(budget_chars)
+            if cap == 0:
+                omitted = self._omissions(budget_chars)
+
+        truncated = dropped = 0
+        rendered = []
+        omitted_per_section: Dict[int, int] = {}
+        for i, (text, truncatable, _, section) in enumerate(self._parts):
+            if i in omitted:
+                dropped += 1
+                omitted_per_section[section] = omitted_per_section.get(section, 0) + 1
+                text = ""
+            elif cap is not None and truncatable and len(text) > cap:
+                if cap == 0:
+                    dropped += 1
+                    text = TRUNCATION_MARKER.format(len(text)).lstrip()
+                else:
+                    truncated += 1
+                    text = text[:cap] + TRUNCATION_MARKER.format(len(text) - cap)
+            rendered.append(text)
+        for section, count in omitted_per_section.items():
+            _, _, end = self._sections[section]
+            rendered[end - 1] += OMISSION_MARKER.format(count)
+
+        prompt = "".join(rendered)
+        sections = {
+            header.strip(" \n🔹"): estimate_tokens("".join(rendered[start:end]))
+            for header, start, end in self._sections
+        }
+        stats = {
+            "budget_tokens": budget_tokens,
+            "evidence_chars": len(prompt),
+            "evidence_tokens": estimate_tokens(prompt),
+            "section_tokens": sections,
+            "truncated_items": truncated,
+            "dropped_items": dropped,
+            "over_budget": len(prompt) > budget_chars,
+        }
+        return prompt, stats
+
+    def _truncation_cap(self, budget_chars: int) -> int:
+        """
+        Largest per-item length such that capping every truncatable item to it
+        brings the total within budget_chars. Walks the truncatable lengths
+        from largest to smallest, so the biggest items are cut first.
+        """
+        fixed = sum(len(text) for text, truncatable, _, _ in self._parts if not truncatable)
+        sizes = sorted((len(text) for text, truncatable, _, _ in self._parts if truncatable), reverse=True)
+        available = budget_chars - fixed
+        if available <= 0 or not sizes:
+            return 0
+
+        # With the k largest items capped at c, the total is k*(c + marker) + sum(sizes[k:])
+        rest = sum(sizes)
+        for k, size in enumerate(sizes, start=1):
+            rest -= size
+            next_size = sizes[k] if k < len(sizes) else 0
+            cap = (available - rest) // k - MARKER_RESERVE
+            if cap >= next_size:
+                return max(cap, 0)
+        return 0
+
+    def _omissions(self, budget_chars: int) -> set:
+        """
+        Positions of the droppable items to omit, lowest drop_key first, so
+        the evidence fits budget_chars with every truncatable item dropped
+        """
+        total = 0
+        for text, truncatable, _, _ in self._parts:
+            if truncatable and text:
+                total += len(TRUNCATION_MARKER.format(len(text)).lstrip())
+            else:
+                total += len(text)
+
+        droppable = sorted((key, i) for i, (_, truncatable, key, _) in enumerate(self._parts)
+                           if key is not None and not truncatable)
+        omitted = set()
+        marked = set()
+        for _, i in droppable:
+            if total <= budget_chars:
+                break
+            text, _, _, section = self._parts[i]
+            omitted.add(i)
+            total -= len(text)
+            if section not in marked:
+                marked.add(section)
+                total += MARKER_RESERVE
+        return omitted
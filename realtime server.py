@@ -1,17 +1,31 @@
 from fastapi import FastAPI, HTTPException, Depends
 from pydantic import BaseModel, Field
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
+from contextlib import asynccontextmanager
+import asyncio
 import statistics
+import time
 from collections import defaultdict
 import random
 import httpx
 import os
 from dotenv import load_dotenv
 
+from http_cache import CachingTransport, HTTPCache
+
 load_dotenv()
 
-app = FastAPI(title="Productivity Scoring System")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Open the upstream connection pools once; every fetch reuses them
+    upstream_clients.open_configured()
+    yield
+    await upstream_clients.close()
+
+
+app = FastAPI(title="Productivity Scoring System", lifespan=lifespan)
 
 
 # ==================== Configuration ====================
@@ -82,68 +96,206 @@ class DataSourceRequest(BaseModel):
     days_lookback: int = 30
 
 
+# ==================== Upstream HTTP Clients ====================
+
+# Commits whose details are fetched per GitHub request, and how many detail requests run at once
+GITHUB_COMMIT_LIMIT = int(os.getenv("GITHUB_COMMIT_LIMIT", "20"))
+GITHUB_DETAIL_CONCURRENCY = int(os.getenv("GITHUB_DETAIL_CONCURRENCY", "8"))
+# Messages collected per Slack request, channels read at once, and a cap on channels read (0 = all).
+# conversations.history is rate limited to about 50 calls a minute, so reading every channel of a
+# large workspace for a quiet user would spend minutes waiting out 429s.
+SLACK_MESSAGE_LIMIT = int(os.getenv("SLACK_MESSAGE_LIMIT", "50"))
+SLACK_HISTORY_CONCURRENCY = int(os.getenv("SLACK_HISTORY_CONCURRENCY", "4"))
+SLACK_MAX_CHANNELS = int(os.getenv("SLACK_MAX_CHANNELS", "50"))
+# Times a rate-limited (429) Slack call is retried after its Retry-After before the source fails
+SLACK_RATE_LIMIT_RETRIES = int(os.getenv("SLACK_RATE_LIMIT_RETRIES", "3"))
+# Per-source deadline in /fetch/real-data; a source that misses it contributes no data
+SOURCE_TIMEOUTS = {
+    "github": float(os.getenv("GITHUB_FETCH_TIMEOUT", "30")),
+    "slack": float(os.getenv("SLACK_FETCH_TIMEOUT", "30")),
+    "jira": float(os.getenv("JIRA_FETCH_TIMEOUT", "30")),
+}
+
+HTTP_LIMITS = httpx.Limits(
+    max_connections=int(os.getenv("HTTP_MAX_CONNECTIONS", "20")),
+    max_keepalive_connections=int(os.getenv("HTTP_MAX_KEEPALIVE", "10")),
+    keepalive_expiry=float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+)
+HTTP_TIMEOUT = httpx.Timeout(float(os.getenv("HTTP_TIMEOUT", "15")))
+
+
+def _http2_enabled() -> bool:
+    if os.getenv("HTTP2_ENABLED", "false").lower() not in ("1", "true", "yes"):
+        return False
+    try:
+        import h2  # noqa: F401 -- httpx needs it for HTTP/2
+    except ImportError:
+        print("HTTP2_ENABLED is set but the h2 package is missing; using HTTP/1.1")
+        return False
+    return True
+
+
+# Commit details are immutable per full SHA, so once cached they are never requested again
+IMMUTABLE_PATHS = [r"^/repos/[^/]+/[^/]+/commits/[0-9a-f]{40}$"]
+UPSTREAM_CACHE_ENABLED = os.getenv("UPSTREAM_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+upstream_cache = HTTPCache(
+    os.getenv("UPSTREAM_CACHE_PATH", "upstream_cache.db"),
+    max_entries=int(os.getenv("UPSTREAM_CACHE_MAX_ENTRIES", "5000"))
+) if UPSTREAM_CACHE_ENABLED else None
+
+
+def build_upstream_client(name: str) -> httpx.AsyncClient:
+    """A keep-alive client for one upstream, with its base URL and credentials from api_config"""
+    transport = httpx.AsyncHTTPTransport(limits=HTTP_LIMITS, http2=_http2_enabled())
+    if upstream_cache is not None:
+        # Conditional requests for validated responses; 304s are answered from the local store
+        transport = CachingTransport(transport, upstream_cache, IMMUTABLE_PATHS)
+    options = {"transport": transport, "timeout": HTTP_TIMEOUT}
+    if name == "github":
+        return httpx.AsyncClient(base_url="https://api.github.com", headers={
+            "Authorization": f"token {api_config.github_token}",
+            "Accept": "application/vnd.github.v3+json"
+        }, **options)
+    if name == "slack":
+        return httpx.AsyncClient(base_url="https://slack.com/api",
+                                 headers={"Authorization": f"Bearer {api_config.slack_token}"}, **options)
+    if name == "jira":
+        return httpx.AsyncClient(base_url=api_config.jira_url.rstrip('/'),
+                                 auth=(api_config.jira_email, api_config.jira_token),
+                                 headers={"Accept": "application/json"}, **options)
+    raise ValueError(f"Unknown upstream: {name}")
+
+
+class _Pool:
+    def __init__(self, client: httpx.AsyncClient):
+        self.client = client
+        self.leases = 0
+        self.retired = False
+
+
+class UpstreamClients:
+    """
+    One pooled client per upstream (github, slack, jira), shared by all fetches.
+    Callers lease a client for the duration of a fetch; reset() retires a
+    pool so the next lease gets a fresh one, and the old client is closed once
+    its last in-flight lease ends.
+    """
+
+    def __init__(self):
+        self._pools: Dict[str, _Pool] = {}
+
+    def open_configured(self):
+        for name in configured_upstreams():
+            self._pool(name)
+
+    def _pool(self, name: str) -> _Pool:
+        if name not in self._pools:
+            self._pools[name] = _Pool(build_upstream_client(name))
+        return self._pools[name]
+
+    @asynccontextmanager
+    async def lease(self, name: str):
+        pool = self._pool(name)
+        pool.leases += 1
+        try:
+            yield pool.client
+        finally:
+            pool.leases -= 1
+            if pool.retired and pool.leases == 0:
+                await pool.client.aclose()
+
+    async def reset(self, names: List[str]):
+        for name in names:
+            pool = self._pools.pop(name, None)
+            if pool is None:
+                continue
+            pool.retired = True
+            if pool.leases == 0:
+                await pool.client.aclose()
+
+    async def close(self):
+        await self.reset(list(self._pools))
+
+
+upstream_clients = UpstreamClients()
+
+
+def configured_upstreams() -> List[str]:
+    names = []
+    if api_config.github_token:
+        names.append("github")
+    if api_config.slack_token:
+        names.append("slack")
+    if api_config.jira_url and api_config.jira_email and api_config.jira_token:
+        names.append("jira")
+    return names
+
+
 # ==================== Real API Data Fetchers ====================
 
 class GitHubDataFetcher:
     """Fetch real data from GitHub API"""
 
-    def __init__(self, token: str):
-        self.token = token
-        self.headers = {
-            "Authorization": f"token {token}",
-            "Accept": "application/vnd.github.v3+json"
-        }
-        self.base_url = "https://api.github.com"
+    def __init__(self, client: httpx.AsyncClient):
+        # Pooled client with the GitHub base URL and token already set
+        self.client = client
 
     async def fetch_user_commits(self, username: str, repo: str = None, days: int = 30) -> List[GitHubCommit]:
         """Fetch commits for a user from GitHub"""
         commits = []
-        since_date = (datetime.now() - timedelta(days=days)).isoformat()
+        # Whole hours keep the URL stable between refreshes so the upstream cache can revalidate it
+        since_date = (datetime.now() - timedelta(days=days)).replace(minute=0, second=0, microsecond=0).isoformat()
 
         try:
-            async with httpx.AsyncClient() as client:
-                # If repo specified, get commits from that repo
-                if repo:
-                    url = f"{self.base_url}/repos/{repo}/commits"
-                    params = {"author": username, "since": since_date, "per_page": 100}
-                    response = await client.get(url, headers=self.headers, params=params)
-                    response.raise_for_status()
-                    commit_list = response.json()
-                else:
-                    # Get user's recent events
-                    url = f"{self.base_url}/users/{username}/events"
-                    response = await client.get(url, headers=self.headers)
-                    response.raise_for_status()
-                    events = response.json()
-                    commit_list = [e for e in events if e.get("type") == "PushEvent"]
-
-                # Process each commit
-                for i, commit_data in enumerate(commit_list[:50]):  # Limit to 50
-                    # Get detailed commit info
-                    if repo and "sha" in commit_data:
-                        detail_url = f"{self.base_url}/repos/{repo}/commits/{commit_data['sha']}"
-                        detail_response = await client.get(detail_url, headers=self.headers)
-                        detail_response.raise_for_status()
-                        details = detail_response.json()
-
-                        stats = details.get("stats", {})
-                        files = details.get("files", [])
-
-                        commits.append(GitHubCommit(
-                            commit_id=commit_data["sha"][:8],
-                            lines_added=stats.get("additions", 0),
-                            lines_deleted=stats.get("deletions", 0),
-                            files_changed=len(files),
-                            review_time_hours=random.uniform(0.5, 3.0),  # Estimate
-                            merge_conflicts=0  # Would need PR API for this
-                        ))
-
-                    if len(commits) >= 20:  # Limit API calls
-                        break
+            # If repo specified, get commits from that repo
+            if repo:
+                url = f"/repos/{repo}/commits"
+                params = {"author": username, "since": since_date, "per_page": 100}
+                response = await self.client.get(url, params=params)
+                response.raise_for_status()
+                commit_list = response.json()
+            else:
+                # Get user's recent events
+                url = f"/users/{username}/events"
+                response = await self.client.get(url)
+                response.raise_for_status()
+                events = response.json()
+                commit_list = [e for e in events if e.get("type") == "PushEvent"]
+
+            # Fetch commit details concurrently; gather keeps them in commit order
+            candidates = [c for c in commit_list if "sha" in c][:GITHUB_COMMIT_LIMIT] if repo else []
+            detail_limit = asyncio.Semaphore(GITHUB_DETAIL_CONCURRENCY)
+
+            async def fetch_detail(commit_data: Dict) -> GitHubCommit:
+                async with detail_limit:
+                    detail_response = await self.client.get(f"/repos/{repo}/commits/{commit_data['sha']}")
+                detail_response.raise_for_status()
+                details = detail_response.json()
+
+                stats = details.get("stats", {})
+                files = details.get("files", [])
+
+                return GitHubCommit(
+                    commit_id=commit_data["sha"][:8],
+                    lines_added=stats.get("additions", 0),
+                    lines_deleted=stats.get("deletions", 0),
+                    files_changed=len(files),
+                    review_time_hours=random.uniform(0.5, 3.0),  # Estimate
+                    merge_conflicts=0  # Would need PR API for this
+                )
+
+            tasks = [asyncio.create_task(fetch_detail(c)) for c in candidates]
+            try:
+                commits = list(await asyncio.gather(*tasks))
+            finally:
+                # On the first failure, don't leave the remaining requests running
+                for task in tasks:
+                    task.cancel()
 
         except httpx.HTTPError as e:
+            # Surface the failure so the aggregator reports it instead of an empty success
             print(f"GitHub API Error: {e}")
-            return []
+            raise
 
         return commits
 
@@ -151,50 +303,102 @@ class GitHubDataFetcher:
 class SlackDataFetcher:
     """Fetch real data from Slack API"""
 
-    def __init__(self, token: str):
-        self.token = token
-        self.headers = {"Authorization": f"Bearer {token}"}
-        self.base_url = "https://slack.com/api"
+    def __init__(self, client: httpx.AsyncClient):
+        # Pooled client with the Slack base URL and token already set
+        self.client = client
+        # Monotonic time before which no request is sent, after a 429
+        self._resume_at = 0.0
+
+    async def _get(self, path: str, params: Dict) -> httpx.Response:
+        """GET honouring Slack rate limits: after a 429 this fetcher's requests wait out Retry-After and the call is retried"""
+        for attempt in range(SLACK_RATE_LIMIT_RETRIES + 1):
+            delay = self._resume_at - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            response = await self.client.get(path, params=params)
+            if response.status_code != 429 or attempt == SLACK_RATE_LIMIT_RETRIES:
+                break
+            try:
+                retry_after = float(response.headers.get("Retry-After", "1"))
+            except ValueError:
+                retry_after = 1.0
+            print(f"Slack rate limited on {path}, retrying in {retry_after:g}s")
+            self._resume_at = max(self._resume_at, time.monotonic() + retry_after)
+        response.raise_for_status()
+        return response
+
+    async def _channel_ids(self) -> List[str]:
+        """All channel ids, following conversations.list pagination, without duplicates"""
+        channel_ids, seen, cursor = [], set(), None
+        while True:
+            params = {"limit": 200}
+            if cursor:
+                params["cursor"] = cursor
+            response = await self._get("/conversations.list", params)
+            body = response.json()
+            for channel in body.get("channels", []):
+                if channel["id"] not in seen:
+                    seen.add(channel["id"])
+                    channel_ids.append(channel["id"])
+            cursor = (body.get("response_metadata") or {}).get("next_cursor")
+            if not cursor or (SLACK_MAX_CHANNELS and len(channel_ids) >= SLACK_MAX_CHANNELS):
+                break
+        return channel_ids[:SLACK_MAX_CHANNELS] if SLACK_MAX_CHANNELS else channel_ids
 
     async def fetch_user_messages(self, user_id: str, days: int = 30) -> List[SlackMessage]:
         """Fetch messages for a user from Slack"""
-        messages = []
         oldest = (datetime.now() - timedelta(days=days)).timestamp()
 
         try:
-            async with httpx.AsyncClient() as client:
-                # Get list of channels
-                channels_response = await client.get(
-                    f"{self.base_url}/conversations.list",
-                    headers=self.headers
-                )
-                channels_response.raise_for_status()
-                channels = channels_response.json().get("channels", [])
-
-                # Search messages from user in channels
-                for channel in channels[:10]:  # Limit to 10 channels
-                    history_response = await client.get(
-                        f"{self.base_url}/conversations.history",
-                        headers=self.headers,
-                        params={"channel": channel["id"], "oldest": oldest, "limit": 100}
-                    )
-                    history_response.raise_for_status()
-                    channel_messages = history_response.json().get("messages", [])
-
-                    for msg in channel_messages:
-                        if msg.get("user") == user_id and "text" in msg:
-                            messages.append(SlackMessage(
-                                message_id=msg.get("ts", ""),
-                                text=msg["text"],
-                                timestamp=datetime.fromtimestamp(float(msg.get("ts", 0)))
-                            ))
-
-                    if len(messages) >= 50:  # Limit total messages
-                        break
+            channel_ids = await self._channel_ids()
+
+            # Workers take channels off a shared queue and page through each one's history
+            queue = list(reversed(channel_ids))
+            by_channel = {channel_id: [] for channel_id in channel_ids}
+            fetched_pages = set()
+            found = 0
+
+            async def read_channels():
+                nonlocal found
+                while queue and found < SLACK_MESSAGE_LIMIT:
+                    channel_id = queue.pop()
+                    cursor = None
+                    while found < SLACK_MESSAGE_LIMIT and (channel_id, cursor) not in fetched_pages:
+                        fetched_pages.add((channel_id, cursor))
+                        params = {"channel": channel_id, "oldest": oldest, "limit": 200}
+                        if cursor:
+                            params["cursor"] = cursor
+                        history_response = await self._get("/conversations.history", params)
+                        body = history_response.json()
+
+                        for msg in body.get("messages", []):
+                            if msg.get("user") == user_id and "text" in msg:
+                                by_channel[channel_id].append(SlackMessage(
+                                    message_id=msg.get("ts", ""),
+                                    text=msg["text"],
+                                    timestamp=datetime.fromtimestamp(float(msg.get("ts", 0)))
+                                ))
+                                found += 1
+
+                        cursor = (body.get("response_metadata") or {}).get("next_cursor")
+                        if not body.get("has_more") or not cursor:
+                            break
+
+            workers = [asyncio.create_task(read_channels())
+                       for _ in range(min(SLACK_HISTORY_CONCURRENCY, len(channel_ids)))]
+            try:
+                await asyncio.gather(*workers)
+            finally:
+                for worker in workers:
+                    worker.cancel()
+
+            # Channel order, then history order, capped at the message quota
+            messages = [m for channel_id in channel_ids for m in by_channel[channel_id]][:SLACK_MESSAGE_LIMIT]
 
         except httpx.HTTPError as e:
+            # Surface the failure so the aggregator reports it instead of an empty success
             print(f"Slack API Error: {e}")
-            return []
+            raise
 
         return messages
 
@@ -202,10 +406,9 @@ class SlackDataFetcher:
 class JiraDataFetcher:
     """Fetch real data from Jira API"""
 
-    def __init__(self, url: str, email: str, token: str):
-        self.url = url.rstrip('/')
-        self.auth = (email, token)
-        self.headers = {"Accept": "application/json"}
+    def __init__(self, client: httpx.AsyncClient):
+        # Pooled client with the Jira base URL and credentials already set
+        self.client = client
 
     async def fetch_user_issues(self, user_email: str, days: int = 30) -> List[JiraIssue]:
         """Fetch issues for a user from Jira"""
@@ -213,50 +416,48 @@ class JiraDataFetcher:
         start_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
 
         try:
-            async with httpx.AsyncClient() as client:
-                # JQL query to get user's issues
-                jql = f'assignee = "{user_email}" AND updated >= "{start_date}" ORDER BY updated DESC'
-
-                response = await client.get(
-                    f"{self.url}/rest/api/3/search",
-                    auth=self.auth,
-                    headers=self.headers,
-                    params={"jql": jql, "maxResults": 50, "fields": "summary,customfield_10016,timespent,priority"}
-                )
-                response.raise_for_status()
-                jira_issues = response.json().get("issues", [])
-
-                for issue in jira_issues:
-                    fields = issue.get("fields", {})
-
-                    # Get story points (customfield_10016 is common, but varies)
-                    story_points = fields.get("customfield_10016", 0) or random.randint(2, 8)
-
-                    # Get time spent
-                    time_spent_seconds = fields.get("timespent", 0) or (story_points * 3600 * 2)
-                    time_spent_hours = time_spent_seconds / 3600
-
-                    # Map priority to complexity
-                    priority = fields.get("priority", {}).get("name", "Medium")
-                    complexity_map = {
-                        "Highest": "high",
-                        "High": "high",
-                        "Medium": "medium",
-                        "Low": "low",
-                        "Lowest": "low"
-                    }
-                    complexity = complexity_map.get(priority, "medium")
-
-                    issues.append(JiraIssue(
-                        issue_id=issue["key"],
-                        story_points=int(story_points) if story_points else 5,
-                        time_spent_hours=time_spent_hours,
-                        complexity=complexity
-                    ))
+            # JQL query to get user's issues
+            jql = f'assignee = "{user_email}" AND updated >= "{start_date}" ORDER BY updated DESC'
+
+            response = await self.client.get(
+                "/rest/api/3/search",
+                params={"jql": jql, "maxResults": 50, "fields": "summary,customfield_10016,timespent,priority"}
+            )
+            response.raise_for_status()
+            jira_issues = response.json().get("issues", [])
+
+            for issue in jira_issues:
+                fields = issue.get("fields", {})
+
+                # Get story points (customfield_10016 is common, but varies)
+                story_points = fields.get("customfield_10016", 0) or random.randint(2, 8)
+
+                # Get time spent
+                time_spent_seconds = fields.get("timespent", 0) or (story_points * 3600 * 2)
+                time_spent_hours = time_spent_seconds / 3600
+
+                # Map priority to complexity
+                priority = fields.get("priority", {}).get("name", "Medium")
+                complexity_map = {
+                    "Highest": "high",
+                    "High": "high",
+                    "Medium": "medium",
+                    "Low": "low",
+                    "Lowest": "low"
+                }
+                complexity = complexity_map.get(priority, "medium")
+
+                issues.append(JiraIssue(
+                    issue_id=issue["key"],
+                    story_points=int(story_points) if story_points else 5,
+                    time_spent_hours=time_spent_hours,
+                    complexity=complexity
+                ))
 
         except httpx.HTTPError as e:
+            # Surface the failure so the aggregator reports it instead of an empty success
             print(f"Jira API Error: {e}")
-            return []
+            raise
 
         return issues
 
@@ -274,41 +475,59 @@ class CalendarDataFetcher:
 
 # ==================== Data Aggregator ====================
 
-async def fetch_real_data(request: DataSourceRequest) -> TeamMemberData:
-    """Aggregate data from all sources"""
+async def _fetch_source(name: str, fetch) -> Tuple[list, Dict]:
+    """
+    Run one source's fetch on its pooled client under that source's timeout.
+    Any failure yields no data for this source only; returns (items, report).
+    """
+    started = time.perf_counter()
+    try:
+        async with upstream_clients.lease(name) as client:
+            items = await asyncio.wait_for(fetch(client), SOURCE_TIMEOUTS[name])
+        report = {"status": "ok", "count": len(items)}
+    except asyncio.TimeoutError:
+        items, report = [], {"status": "timeout", "count": 0}
+    except Exception as e:
+        items, report = [], {"status": "error", "count": 0, "error": f"{type(e).__name__}: {e}"}
+    report["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    print(f"  {name}: {report['status']}, {report['count']} items in {report['elapsed_ms']} ms")
+    return items, report
+
+
+async def fetch_real_data(request: DataSourceRequest) -> Tuple[TeamMemberData, Dict[str, Dict]]:
+    """Aggregate data from all sources concurrently; also returns a per-source status/timing report"""
 
     member_id = request.github_username or request.slack_user_id or request.jira_user_email or "unknown"
     name = member_id
 
-    commits = []
-    messages = []
-    issues = []
     meetings = []
 
-    # Fetch GitHub data
+    fetches = {}
     if api_config.github_token and request.github_username:
-        print(f"Fetching GitHub data for {request.github_username}...")
-        fetcher = GitHubDataFetcher(api_config.github_token)
-        commits = await fetcher.fetch_user_commits(
+        fetches["github"] = lambda client: GitHubDataFetcher(client).fetch_user_commits(
             request.github_username,
             request.github_repo,
             request.days_lookback
         )
-        print(f"  ✓ Found {len(commits)} commits")
-
-    # Fetch Slack data
     if api_config.slack_token and request.slack_user_id:
-        print(f"Fetching Slack data for {request.slack_user_id}...")
-        fetcher = SlackDataFetcher(api_config.slack_token)
-        messages = await fetcher.fetch_user_messages(request.slack_user_id, request.days_lookback)
-        print(f"  ✓ Found {len(messages)} messages")
-
-    # Fetch Jira data
+        fetches["slack"] = lambda client: SlackDataFetcher(client).fetch_user_messages(
+            request.slack_user_id, request.days_lookback
+        )
     if all([api_config.jira_url, api_config.jira_email, api_config.jira_token]) and request.jira_user_email:
-        print(f"Fetching Jira data for {request.jira_user_email}...")
-        fetcher = JiraDataFetcher(api_config.jira_url, api_config.jira_email, api_config.jira_token)
-        issues = await fetcher.fetch_user_issues(request.jira_user_email, request.days_lookback)
-        print(f"  ✓ Found {len(issues)} issues")
+        fetches["jira"] = lambda client: JiraDataFetcher(client).fetch_user_issues(
+            request.jira_user_email, request.days_lookback
+        )
+
+    print(f"Fetching {', '.join(fetches) or 'no'} data for {member_id}...")
+    results = await asyncio.gather(*(_fetch_source(source, fetch) for source, fetch in fetches.items()))
+    fetched = dict(zip(fetches, results))
+    sources = {source: {"status": "skipped", "count": 0, "elapsed_ms": 0.0}
+               for source in ("github", "slack", "jira")}
+    sources.update({source: report for source, (_, report) in fetched.items()})
+
+    commits = fetched["github"][0] if "github" in fetched else []
+    messages = fetched["slack"][0] if "slack" in fetched else []
+    issues = fetched["jira"][0] if "jira" in fetched else []
 
     # Generate some estimated meeting data if no calendar integration
     print("Generating estimated meeting data...")
@@ -326,7 +545,7 @@ async def fetch_real_data(request: DataSourceRequest) -> TeamMemberData:
         slack_messages=messages,
         jira_issues=issues,
         meetings=meetings
-    )
+    ), sources
 
 
 # ==================== Mock Data Generator (Fallback) ====================
@@ -601,6 +820,7 @@ def normalize_team_scores(team_scores: Dict[str, float]) -> Dict[str, Dict[str,
 async def update_config(config: APIConfig):
     """Update API configuration"""
     global api_config
+    before = api_config.model_copy()
     if config.github_token:
         api_config.github_token = config.github_token
     if config.slack_token:
@@ -612,6 +832,17 @@ async def update_config(config: APIConfig):
     if config.jira_token:
         api_config.jira_token = config.jira_token
 
+    # Pools carry credentials, so rebuild those whose settings changed
+    changed = []
+    if api_config.github_token != before.github_token:
+        changed.append("github")
+    if api_config.slack_token != before.slack_token:
+        changed.append("slack")
+    if (api_config.jira_url, api_config.jira_email, api_config.jira_token) != \
+            (before.jira_url, before.jira_email, before.jira_token):
+        changed.append("jira")
+    await upstream_clients.reset(changed)
+
     return {"message": "Configuration updated", "configured_apis": {
         "github": bool(api_config.github_token),
         "slack": bool(api_config.slack_token),
@@ -643,7 +874,7 @@ async def fetch_data_endpoint(request: DataSourceRequest):
     print("🔍 Fetching Real Data from APIs...")
     print(f"{'=' * 60}\n")
 
-    member_data = await fetch_real_data(request)
+    member_data, sources = await fetch_real_data(request)
 
     # Analyze the data
     commit_impacts = [calculate_commit_impact(c) for c in member_data.github_commits]
@@ -662,6 +893,7 @@ async def fetch_data_endpoint(request: DataSourceRequest):
             "jira_issues": len(member_data.jira_issues),
             "meetings": len(member_data.meetings)
         },
+        "sources": sources,
         "scores": {
             "ml_score": ml_score,
             "code_impact": round(statistics.mean(commit_scores), 2) if commit_scores else 0,
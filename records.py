@@ -0,0 +1,116 @@
+from typing import Any, Dict, Iterable, List, Optional
+
+
+class Record:
+    """
+    Base for the compact records helper.py produces. Subclasses list their
+    fields in __slots__, in the key order of the JSON shape they serialize to.
+    """
+    __slots__ = ()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: _plain(getattr(self, name)) for name in self.__slots__}
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+def _plain(value):
+    if isinstance(value, Record):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [_plain(v) for v in value]
+    return value
+
+
+def dump_records(records: Iterable[Record]) -> List[Dict[str, Any]]:
+    """
+    Serialize records to the plain dicts the API returns
+    """
+    return [record.to_dict() for record in records]
+
+
+class SlackMessage(Record):
+    __slots__ = ("channel", "timestamp", "text", "contains_code")
+
+    def __init__(self, channel: str, timestamp: str, text: str, contains_code: bool):
+        self.channel = channel
+        self.timestamp = timestamp
+        self.text = text
+        self.contains_code = contains_code
+
+
+class Commit(Record):
+    __slots__ = ("sha", "date", "message", "files_changed", "lines_added", "lines_deleted", "area", "codediff")
+
+    def __init__(self, sha: str, date: str, message: str, files_changed: int, lines_added: int,
+                 lines_deleted: int, area: str, codediff: str):
+        self.sha = sha
+        self.date = date
+        self.message = message
+        self.files_changed = files_changed
+        self.lines_added = lines_added
+        self.lines_deleted = lines_deleted
+        self.area = area
+        self.codediff = codediff
+
+
+class TranscriptLine(Record):
+    __slots__ = ("user", "text")
+
+    def __init__(self, user: str, text: str):
+        self.user = user
+        self.text = text
+
+
+class MeetingFlow(Record):
+    __slots__ = ("meeting_id", "flow")
+
+    def __init__(self, meeting_id: Optional[str], flow: List[TranscriptLine]):
+        self.meeting_id = meeting_id
+        self.flow = flow
+
+
+class ReceivedCode(Record):
+    __slots__ = ("channel", "from_user", "code_snippet", "acknowledged_by_user")
+
+    def __init__(self, channel: str, from_user: str, code_snippet: str, acknowledged_by_user: str):
+        self.channel = channel
+        self.from_user = from_user
+        self.code_snippet = code_snippet
+        self.acknowledged_by_user = acknowledged_by_user
+
+
+class KudosEdge(Record):
+    """
+    A slack_ack edge carries ack_text, a github_usage edge carries commit_sha;
+    each serializes only its own field.
+    """
+    __slots__ = ("from_user", "to_user", "channel", "code_snippet", "ack_text", "commit_sha", "type")
+
+    def __init__(self, from_user: str, to_user: str, channel: str, code_snippet: str, type: str,
+                 ack_text: Optional[str] = None, commit_sha: Optional[str] = None):
+        self.from_user = from_user
+        self.to_user = to_user
+        self.channel = channel
+        self.code_snippet = code_snippet
+        self.ack_text = ack_text
+        self.commit_sha = commit_sha
+        self.type = type
+
+    def to_dict(self) -> Dict[str, Any]:
+        extra = ("ack_text", self.ack_text) if self.type == "slack_ack" else ("commit_sha", self.commit_sha)
+        return {
+            "from_user": self.from_user,
+            "to_user": self.to_user,
+            "channel": self.channel,
+            "code_snippet": self.code_snippet,
+            extra[0]: extra[1],
+            "type": self.type
+        }
@@ -0,0 +1,68 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+
+class ScoreCache:
+    """
+    Persistent, content-addressed cache of validated score results.
+    Keys hash the scoring evidence together with the prompt template version
+    and model name, so any change to what the LLM would see misses the cache.
+    Entries expire after ttl_seconds and the least recently used ones are
+    evicted beyond max_entries.
+    """
+
+    def __init__(self, path: str, max_entries: int = 1000, ttl_seconds: float = 24 * 3600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS score_cache ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS score_cache_last_used ON score_cache (last_used)")
+        self._conn.commit()
+
+    @staticmethod
+    def key(evidence: str, prompt_version: str, model: str) -> str:
+        digest = hashlib.sha256()
+        for part in (prompt_version, model, evidence):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Cached result JSON for key, or None if absent or expired
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, created_at FROM score_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            value, created_at = row
+            if now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM score_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE score_cache SET last_used = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            return value
+
+    def put(self, key: str, value: str):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO score_cache (key, value, created_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, value, now, now)
+            )
+            self._conn.execute("DELETE FROM score_cache WHERE created_at < ?", (now - self.ttl_seconds,))
+            self._conn.execute(
+                "DELETE FROM score_cache WHERE key IN ("
+                " SELECT key FROM score_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+            self._conn.commit()
@@ -0,0 +1,59 @@
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+
+class ScoreHistoryStore:
+    """
+    Append-only log of every score produced, indexed by user, model and time,
+    so past results can be read back without another LLM call. Reads are per
+    model, so stub load-test scores never show up as real ones.
+    """
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS score_history ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT, user_id TEXT NOT NULL, model TEXT NOT NULL,"
+            " scored_at REAL NOT NULL, result TEXT NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS score_history_user_model_time ON score_history (user_id, model, scored_at)"
+        )
+        self._conn.commit()
+
+    def append(self, user_id: str, model: str, result: str):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO score_history (user_id, model, scored_at, result) VALUES (?, ?, ?, ?)",
+                (user_id, model, time.time(), result)
+            )
+            self._conn.commit()
+
+    def latest(self, user_id: str, model: str) -> Optional[Dict]:
+        entries = self.history(user_id, model, limit=1)
+        return entries[0] if entries else None
+
+    def history(self, user_id: str, model: str, limit: int = 50, since: Optional[float] = None,
+                until: Optional[float] = None) -> List[Dict]:
+        """
+        {"scored_at", "model", "result"} entries for user_id scored by model with
+        since <= scored_at < until, newest first
+        """
+        query = "SELECT scored_at, model, result FROM score_history WHERE user_id = ? AND model = ?"
+        args = [user_id, model]
+        if since is not None:
+            query += " AND scored_at >= ?"
+            args.append(since)
+        if until is not None:
+            query += " AND scored_at < ?"
+            args.append(until)
+        query += " ORDER BY scored_at DESC, id DESC LIMIT ?"
+        args.append(limit)
+        with self._lock:
+            rows = self._conn.execute(query, args).fetchall()
+        return [{"scored_at": scored_at, "model": model, "result": json.loads(result)}
+                for scored_at, model, result in rows]
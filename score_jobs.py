@@ -0,0 +1,181 @@
+import asyncio
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Awaitable, Callable, Dict, List, Optional
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+class JobStore:
+    """
+    SQLite-backed scoring job queue, safe to share between processes. Jobs are
+    claimed highest priority first, oldest first within a priority, in a single
+    UPDATE so no two workers get the same job. A running job is leased to its
+    owner, who keeps it alive with heartbeats; once a lease lapses (the owner
+    crashed) the job goes back in the queue.
+    """
+
+    def __init__(self, path: str, lease_seconds: float = 60):
+        self.lease_seconds = lease_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS score_jobs ("
+            " id TEXT PRIMARY KEY, user_id TEXT NOT NULL, params TEXT NOT NULL, priority INTEGER NOT NULL,"
+            " status TEXT NOT NULL, result TEXT, error TEXT,"
+            " created_at REAL NOT NULL, started_at REAL, finished_at REAL, owner TEXT, heartbeat_at REAL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS score_jobs_queue ON score_jobs (status, priority DESC, created_at)"
+        )
+        self._conn.commit()
+
+    def enqueue(self, user_id: str, params: Dict, priority: int = 0) -> str:
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO score_jobs (id, user_id, params, priority, status, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, user_id, json.dumps(params), priority, QUEUED, time.time())
+            )
+            self._conn.commit()
+        return job_id
+
+    def claim_next(self, owner: str) -> Optional[Dict]:
+        """
+        Lease the next queued job to owner and return it, or None if the queue is empty
+        """
+        now = time.time()
+        with self._lock:
+            # Jobs whose owner stopped heartbeating are up for grabs again
+            self._conn.execute(
+                "UPDATE score_jobs SET status = ?, owner = NULL, started_at = NULL, heartbeat_at = NULL"
+                " WHERE status = ? AND heartbeat_at < ?",
+                (QUEUED, RUNNING, now - self.lease_seconds)
+            )
+            row = self._conn.execute(
+                "UPDATE score_jobs SET status = ?, owner = ?, started_at = ?, heartbeat_at = ?"
+                " WHERE id = (SELECT id FROM score_jobs WHERE status = ? ORDER BY priority DESC, created_at LIMIT 1)"
+                " AND status = ? RETURNING *",
+                (RUNNING, owner, now, now, QUEUED, QUEUED)
+            ).fetchone()
+            self._conn.commit()
+        if row is None:
+            return None
+        job = dict(row)
+        job["params"] = json.loads(job["params"])
+        return job
+
+    def heartbeat(self, owner: str):
+        """
+        Extend the lease on every job owner is running
+        """
+        with self._lock:
+            self._conn.execute(
+                "UPDATE score_jobs SET heartbeat_at = ? WHERE owner = ? AND status = ?", (time.time(), owner, RUNNING)
+            )
+            self._conn.commit()
+
+    def release(self, owner: str):
+        """
+        Put owner's running jobs back in the queue, e.g. on shutdown
+        """
+        with self._lock:
+            self._conn.execute(
+                "UPDATE score_jobs SET status = ?, owner = NULL, started_at = NULL, heartbeat_at = NULL"
+                " WHERE owner = ? AND status = ?",
+                (QUEUED, owner, RUNNING)
+            )
+            self._conn.commit()
+
+    def finish(self, job_id: str, owner: str, result: Optional[str] = None, error: Optional[str] = None):
+        # Only the current lease holder may complete the job; a worker whose lease lapsed is ignored
+        with self._lock:
+            self._conn.execute(
+                "UPDATE score_jobs SET status = ?, result = ?, error = ?, finished_at = ?"
+                " WHERE id = ? AND owner = ? AND status = ?",
+                (FAILED if error is not None else DONE, result, error, time.time(), job_id, owner, RUNNING)
+            )
+            self._conn.commit()
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM score_jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["params"] = json.loads(job["params"])
+        job["result"] = json.loads(job["result"]) if job["result"] is not None else None
+        return job
+
+
+class JobWorkerPool:
+    """
+    A fixed number of asyncio workers draining a JobStore. handler(user_id,
+    params) returns the job's result as JSON text; an exception fails the job.
+    Idle workers wake on notify() for jobs enqueued in this process, and poll
+    every poll_seconds for jobs enqueued or requeued elsewhere.
+    """
+
+    def __init__(self, store: JobStore, handler: Callable[[str, Dict], Awaitable[str]], workers: int = 2,
+                 poll_seconds: float = 5):
+        self.store = store
+        self.handler = handler
+        self.workers = workers
+        self.poll_seconds = poll_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._wakeup: Optional[asyncio.Event] = None
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self):
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._heartbeat()))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        # Hand unfinished jobs back right away instead of waiting for the lease to lapse
+        await asyncio.to_thread(self.store.release, self.owner)
+
+    def notify(self):
+        """
+        Wake idle workers after a job was enqueued
+        """
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _heartbeat(self):
+        while True:
+            await asyncio.sleep(self.store.lease_seconds / 3)
+            await asyncio.to_thread(self.store.heartbeat, self.owner)
+
+    async def _work(self):
+        while True:
+            job = await asyncio.to_thread(self.store.claim_next, self.owner)
+            if job is None:
+                self._wakeup.clear()
+                # Re-check so a job enqueued between the claim and clear() isn't missed
+                job = await asyncio.to_thread(self.store.claim_next, self.owner)
+                if job is None:
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), self.poll_seconds)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+            try:
+                result = await self.handler(job["user_id"], job["params"])
+            except asyncio.CancelledError:
+                # Shutting down: stop() releases the job back to the queue
+                raise
+            except Exception as e:
+                await asyncio.to_thread(self.store.finish, job["id"], self.owner, None, str(e))
+            else:
+                await asyncio.to_thread(self.store.finish, job["id"], self.owner, result)
@@ -0,0 +1,50 @@
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+
+class ScoreWatermarkStore:
+    """
+    Per-user record of the last score and the evidence it covered (commit
+    SHAs, digests of Slack messages and code-relation edges, the last meeting
+    id), so the next run only scores what is new.
+    State is kept per model, so scores from one LLM backend (e.g. the offline
+    stub) are never the starting point for another's.
+    """
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS score_watermarks ("
+            " user_id TEXT NOT NULL, model TEXT NOT NULL, prompt_version TEXT NOT NULL, watermark TEXT NOT NULL,"
+            " result TEXT NOT NULL, updated_at REAL NOT NULL, PRIMARY KEY (user_id, model))"
+        )
+        self._conn.commit()
+
+    def get(self, user_id: str, model: str, prompt_version: str) -> Optional[Dict]:
+        """
+        {"watermark": ..., "result": <result JSON>} for user_id under model, or
+        None if the user was never scored by it or was scored under another
+        prompt version
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT prompt_version, watermark, result FROM score_watermarks WHERE user_id = ? AND model = ?",
+                (user_id, model)
+            ).fetchone()
+        if row is None or row[0] != prompt_version:
+            return None
+        return {"watermark": json.loads(row[1]), "result": row[2]}
+
+    def put(self, user_id: str, model: str, prompt_version: str, watermark: Dict, result: str):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO score_watermarks"
+                " (user_id, model, prompt_version, watermark, result, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (user_id, model, prompt_version, json.dumps(watermark), result, time.time())
+            )
+            self._conn.commit()
+
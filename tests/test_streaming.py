@@ -0,0 +1,150 @@
+import json
+import os
+import shutil
+
+import pytest
+
+from compiled_snapshot import CompiledCommitStore, CompiledSlackUserIndex
+from helper import (get_team_meeting_flows, get_user_github_commits, get_user_meeting_transcripts_with_context,
+                    get_user_slack_messages, stream_json)
+from workspace import SLACK_CHANNELS_PATH, SLACK_MESSAGES_PATH, WorkspaceStore, compile_sources
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Awkward values for a byte-at-a-time reader: numbers that could be cut short
+# at a window edge, escapes, surrogate pairs, nesting and empty containers.
+TRICKY_DOC = {
+    "numbers": [0, -1, 1.5, 1.5e3, -2.25E-7, 12345678901234567890, 1e308],
+    "strings": ["", "quote \" backslash \\ slash \\/", "tab\tnewline\n", "é中", "😀", "\u0000"],
+    "literals": [True, False, None],
+    "empty": {"list": [], "dict": {}},
+    "channels": [
+        {"channel_id": "a", "messages": [{"ts": "1", "user": "u1", "text": "x", "n": 10}, {"ts": "2", "text": "y"}]},
+        {"channel_id": "b", "messages": []},
+        {"channel_id": "c", "messages": [{"ts": "3", "user": "u2", "text": "{\"not\": [\"json\"]}", "n": 2.0}]},
+    ],
+}
+
+
+def _write(path, doc, indent=None):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(doc, f, indent=indent, ensure_ascii=False)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 1 << 20])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_stream_json_matches_json_load(tmp_path, chunk_size, indent):
+    path = tmp_path / "doc.json"
+    _write(path, TRICKY_DOC, indent)
+    handlers = {SLACK_CHANNELS_PATH: None, SLACK_MESSAGES_PATH: None, ("numbers", "[]"): None}
+    with open(path, encoding="utf-8") as f:
+        assert stream_json(str(path), handlers, chunk_size=chunk_size) == json.load(f)
+
+
+def test_stream_json_handler_order(tmp_path):
+    path = tmp_path / "doc.json"
+    _write(path, TRICKY_DOC)
+    calls = []
+    doc = stream_json(str(path), {
+        SLACK_CHANNELS_PATH: lambda channel, pos: calls.append(("channel", channel["channel_id"], pos)),
+        SLACK_MESSAGES_PATH: lambda msg, pos: calls.append(("message", msg["ts"], pos)),
+    }, chunk_size=1)
+    # Elements arrive in document order, each container after its own elements
+    assert calls == [
+        ("message", "1", (0, 0)), ("message", "2", (0, 1)), ("channel", "a", (0,)),
+        ("channel", "b", (1,)),
+        ("message", "3", (2, 0)), ("channel", "c", (2,)),
+    ]
+    assert doc == TRICKY_DOC
+
+
+def test_stream_json_keep_false_drops_handled_elements(tmp_path):
+    path = tmp_path / "doc.json"
+    _write(path, TRICKY_DOC)
+    seen = []
+    doc = stream_json(str(path), {SLACK_MESSAGES_PATH: lambda msg, pos: seen.append(pos)}, chunk_size=1, keep=False)
+    assert seen == [(0, 0), (0, 1), (2, 0)]
+    assert [channel["messages"] for channel in doc["channels"]] == [[], [], []]
+    assert doc["numbers"] == TRICKY_DOC["numbers"]
+
+
+def _synthetic_sources(directory):
+    slack = {
+        "workspace": "w",
+        "users": ["alice", "bob", "carol"],
+        "channels": [
+            {"channel_id": "dev", "messages": [
+                {"ts": "2026-01-02T09:59:00Z", "text": "bot message without a user"},
+                {"ts": "2026-01-02T10:00:00Z", "user": "alice", "text": "def f(): pass", "contains_code": True},
+                {"ts": "2026-01-02T10:01:00Z", "user": "bob", "text": "thanks!"},
+                {"ts": "2026-01-02T10:03:00Z", "user": "carol", "text": "nice", "contains_code": False},
+            ]},
+            {"channel_id": "empty", "messages": []},
+            {"channel_id": "ops", "messages": [
+                {"ts": "2026-01-01T09:00:00Z", "user": "bob", "text": "SELECT 1", "contains_code": True},
+                {"ts": "2026-01-01T09:05:00Z", "user": "alice", "text": "used it"},
+            ]},
+        ],
+    }
+    github = {
+        "repo": "r",
+        "commits": [
+            {"sha": "c3", "author": "alice", "email": "a@x", "date": "2026-01-03T00:00:00Z", "files_changed": "2",
+             "lines_added": 5, "lines_deleted": "", "commit_message": "later", "area": "api", "codediff": "SELECT 1"},
+            {"sha": "c1", "author": "alice", "date": "2026-01-01T00:00:00Z", "files_changed": 1,
+             "lines_added": 1, "lines_deleted": 0, "commit_message": "first", "area": "api",
+             "codediff": "def f(): pass"},
+            {"sha": "c2", "author": "bob", "email": "b@x", "date": "2026-01-01T00:00:00Z", "files_changed": 3,
+             "lines_added": 2, "lines_deleted": 1, "commit_message": "same date", "area": "db", "codediff": ""},
+            {"sha": "c0", "date": "2025-12-31T00:00:00Z", "files_changed": 0, "lines_added": 0,
+             "lines_deleted": 0, "commit_message": "no author", "area": "db", "codediff": ""},
+        ],
+    }
+    meetings = [
+        {"meeting_id": "m1", "transcript": [
+            {"user": "alice", "text": "hi"}, {"user": "bob", "text": "blocked"}, {"user": "carol", "text": "ok"},
+            {"user": "alice", "text": "bye"},
+        ]},
+        {"meeting_id": "m2", "transcript": []},
+    ]
+    for name, doc in (("slack.json", slack), ("github.json", github), ("meetings.json", meetings)):
+        _write(directory / name, doc)
+
+
+def _repo_sources(directory):
+    for src, name in (("slack_data.json", "slack.json"), ("github_commits.json", "github.json"),
+                      ("meeting.json", "meetings.json")):
+        shutil.copy(os.path.join(REPO, src), directory / name)
+
+
+@pytest.mark.parametrize("make_sources", [_synthetic_sources, _repo_sources])
+def test_compiled_snapshot_matches_json_sources(tmp_path, make_sources):
+    make_sources(tmp_path)
+    paths = tuple(str(tmp_path / name) for name in ("slack.json", "github.json", "meetings.json"))
+    snapshot_path = str(tmp_path / "workspace.snap")
+
+    parsed = WorkspaceStore(*paths, snapshot_path=None).get()
+    store = WorkspaceStore(*paths, snapshot_path=snapshot_path)
+    compile_sources(paths, store._stat(), snapshot_path)
+    compiled = store.get()
+    assert isinstance(compiled.slack_index, CompiledSlackUserIndex)
+    assert isinstance(compiled.commit_store, CompiledCommitStore)
+
+    users = set(parsed.slack_data["users"]) | set(parsed.slack_index.users()) | set(parsed.commit_store.authors())
+    assert compiled.slack_data["users"] == parsed.slack_data["users"]
+    assert compiled.slack_index.users() == parsed.slack_index.users()
+    assert compiled.commit_store.authors() == parsed.commit_store.authors()
+    for user in sorted(users) + ["nobody"]:
+        assert (get_user_slack_messages(compiled.slack_data, user, index=compiled.slack_index)
+                == get_user_slack_messages(parsed.slack_data, user, index=parsed.slack_index)
+                == get_user_slack_messages(parsed.slack_data, user))
+        for since, until in ((None, None), ("2026-01-01T00:00:00Z", None), (None, "2026-01-02T00:00:00Z")):
+            assert (get_user_github_commits(compiled.github_data, user, store=compiled.commit_store,
+                                            since=since, until=until)
+                    == get_user_github_commits(parsed.github_data, user, store=parsed.commit_store,
+                                               since=since, until=until))
+        assert (get_user_meeting_transcripts_with_context(compiled.transcripts_data, user,
+                                                          index=compiled.meeting_index)
+                == get_user_meeting_transcripts_with_context(parsed.transcripts_data, user))
+    assert get_team_meeting_flows(compiled.transcripts_data) == get_team_meeting_flows(parsed.transcripts_data)
+    assert compiled.code_relations == parsed.code_relations
@@ -0,0 +1,265 @@
+import asyncio
+import os
+import threading
+from functools import cached_property
+from typing import Dict, List, Optional, Tuple
+
+from compiled_snapshot import CompiledCommitStore, CompiledSlackUserIndex, SnapshotWriter, open_snapshot
+from helper import (CommitStore, GitHubUsageIndex, MeetingSpeakerIndex, SlackUserIndex, SymbolTable,
+                    extract_team_code_relations, load_json, stream_json)
+from records import Record
+
+SLACK_PATH = "slack_data.json"
+GITHUB_PATH = "github_commits.json"
+MEETINGS_PATH = "meeting.json"
+# Output of `python workspace.py`; mapped at startup instead of parsing JSON while it is fresh
+SNAPSHOT_PATH = os.getenv("WORKSPACE_SNAPSHOT", "workspace.snap")
+
+# Record arrays that are streamed one element at a time in incremental mode
+SLACK_CHANNELS_PATH = ("channels", "[]")
+SLACK_MESSAGES_PATH = ("channels", "[]", "messages", "[]")
+COMMITS_PATH = ("commits", "[]")
+MEETING_RECORDS_PATH = ("[]",)
+TRANSCRIPT_PATH = ("[]", "transcript", "[]")
+
+# "auto" streams any source file larger than STREAMING_THRESHOLD_BYTES,
+# "always"/"never" force the mode for every file. With a snapshot path, a
+# streamed workspace is compiled to it and mapped instead of loaded.
+STREAMING_MODE = os.getenv("WORKSPACE_STREAMING", "auto")
+STREAMING_THRESHOLD_BYTES = int(os.getenv("WORKSPACE_STREAMING_THRESHOLD", str(64 * 1024 * 1024)))
+
+# (mtime_ns, size) for each source file, in SLACK, GITHUB, MEETINGS order
+SourceStamp = Tuple[Tuple[int, int], ...]
+
+
+class WorkspaceSnapshot:
+    """
+    The three workspace sources as they were parsed at one point in time.
+    A snapshot is never mutated after it is built; reloads swap in a new one.
+    Indexes built while streaming are passed in; otherwise they are built here.
+    """
+
+    def __init__(self, slack_data: Dict, github_data: Dict, transcripts_data: List[Dict], stamp: SourceStamp,
+                 slack_index: Optional[SlackUserIndex] = None, commit_store: Optional[CommitStore] = None,
+                 meeting_index: Optional[MeetingSpeakerIndex] = None, symbols: Optional[SymbolTable] = None):
+        self.slack_data = slack_data
+        self.github_data = github_data
+        self.transcripts_data = transcripts_data
+        self.stamp = stamp
+        self.symbols = symbols if symbols is not None else SymbolTable()
+        if slack_index is None:
+            slack_index = SlackUserIndex.build(slack_data, self.symbols)
+        if commit_store is None:
+            commit_store = CommitStore.build(github_data, self.symbols)
+        self.slack_index = slack_index
+        self.commit_store = commit_store
+        self._meeting_index = meeting_index
+
+    @cached_property
+    def meeting_index(self) -> MeetingSpeakerIndex:
+        # Built during loading for JSON sources; on first use for a compiled snapshot
+        if self._meeting_index is not None:
+            return self._meeting_index
+        return MeetingSpeakerIndex.build(self.transcripts_data, self.symbols)
+
+    @cached_property
+    def github_usage(self) -> GitHubUsageIndex:
+        # Built on first use so mapping a compiled snapshot stays instant
+        return GitHubUsageIndex(self.slack_data, self.github_data)
+
+    @cached_property
+    def code_relations(self) -> Dict[str, Dict[str, List[Record]]]:
+        # Peer kudos and received code for every user, computed in one pass per
+        # snapshot; per-user requests read their slice from here.
+        return extract_team_code_relations(self.slack_data, self.github_data, self.github_usage)
+
+
+def _should_stream(size: int) -> bool:
+    if STREAMING_MODE == "always":
+        return True
+    if STREAMING_MODE == "never":
+        return False
+    return size > STREAMING_THRESHOLD_BYTES
+
+
+def load_slack(path: str, streaming: bool, symbols: SymbolTable) -> Tuple[Dict, SlackUserIndex]:
+    if not streaming:
+        slack_data = load_json(path)
+        return slack_data, SlackUserIndex.build(slack_data, symbols)
+    index = SlackUserIndex(symbols)
+    slack_data = stream_json(path, {
+        SLACK_CHANNELS_PATH: lambda channel, pos: index.add_channel(pos[0], channel),
+        SLACK_MESSAGES_PATH: lambda msg, pos: index.add(pos[0], pos[1], msg)
+    })
+    return slack_data, index
+
+
+def load_github(path: str, streaming: bool, symbols: SymbolTable) -> Tuple[Dict, CommitStore]:
+    if not streaming:
+        github_data = load_json(path)
+        return github_data, CommitStore.build(github_data, symbols)
+    store = CommitStore(symbols)
+    github_data = stream_json(path, {COMMITS_PATH: lambda commit, pos: store.add(commit)})
+    return github_data, store.finalize()
+
+
+def load_meetings(path: str, streaming: bool, symbols: SymbolTable) -> Tuple[List[Dict], MeetingSpeakerIndex]:
+    if not streaming:
+        transcripts_data = load_json(path)
+        return transcripts_data, MeetingSpeakerIndex.build(transcripts_data, symbols)
+    index = MeetingSpeakerIndex(symbols)
+    transcripts_data = stream_json(path, {
+        MEETING_RECORDS_PATH: lambda meeting, pos: index.add_meeting(pos[0], meeting),
+        TRANSCRIPT_PATH: lambda line, pos: index.add(pos[0], pos[1], line)
+    })
+    return transcripts_data, index
+
+
+def compile_sources(paths: Tuple[str, str, str], stamp: SourceStamp, out_path: str):
+    """
+    Compile the slack, github and meetings sources at paths into a binary
+    snapshot at out_path, stamped with stamp. Each source is streamed straight
+    into the snapshot's columns, so only one record is held as Python objects
+    at a time.
+    """
+    slack_path, github_path, meetings_path = paths
+    writer = SnapshotWriter()
+    writer.add_slack_document(stream_json(slack_path, {
+        SLACK_CHANNELS_PATH: lambda channel, pos: writer.add_channel(channel),
+        SLACK_MESSAGES_PATH: lambda msg, pos: writer.add_message(msg)
+    }, keep=False))
+    writer.add_github_document(stream_json(github_path, {
+        COMMITS_PATH: lambda commit, pos: writer.add_commit(commit)
+    }, keep=False))
+    stream_json(meetings_path, {
+        MEETING_RECORDS_PATH: lambda meeting, pos: writer.add_meeting(meeting),
+        TRANSCRIPT_PATH: lambda line, pos: writer.add_line(line)
+    }, keep=False)
+    writer.write(out_path, stamp)
+
+
+class WorkspaceStore:
+    """
+    Process-wide holder of the current WorkspaceSnapshot.
+    Source files are stat'ed on every access and re-parsed only when their
+    mtime or size changed. A fresh compiled snapshot is mapped instead of
+    parsing; if there is none and a source is large enough to stream, the
+    sources are compiled to snapshot_path first rather than held as objects.
+    """
+
+    def __init__(self, slack_path: str = SLACK_PATH, github_path: str = GITHUB_PATH,
+                 meetings_path: str = MEETINGS_PATH, snapshot_path: Optional[str] = SNAPSHOT_PATH):
+        self.paths = (slack_path, github_path, meetings_path)
+        self.snapshot_path = snapshot_path
+        self._snapshot: Optional[WorkspaceSnapshot] = None
+        self._lock = threading.Lock()
+
+    def _stat(self) -> SourceStamp:
+        stamp = []
+        for path in self.paths:
+            st = os.stat(path)
+            stamp.append((st.st_mtime_ns, st.st_size))
+        return tuple(stamp)
+
+    def _load(self, stamp: SourceStamp) -> WorkspaceSnapshot:
+        compiled = open_snapshot(self.snapshot_path, stamp) if self.snapshot_path else None
+        if compiled is None and self.snapshot_path and any(_should_stream(size) for _, size in stamp):
+            print(f"Workspace snapshot missing or stale, compiling {self.snapshot_path}")
+            try:
+                compile_sources(self.paths, stamp, self.snapshot_path)
+            except OSError as e:
+                print(f"Could not write workspace snapshot, parsing sources instead: {e}")
+            else:
+                compiled = open_snapshot(self.snapshot_path, stamp)
+        if compiled is None:
+            return self.load_sources(stamp)
+        return WorkspaceSnapshot(
+            slack_data=compiled.slack_data(),
+            github_data=compiled.github_data(),
+            transcripts_data=compiled.transcripts_data(),
+            stamp=stamp,
+            slack_index=CompiledSlackUserIndex(compiled),
+            commit_store=CompiledCommitStore(compiled)
+        )
+
+    def load_sources(self, stamp: SourceStamp) -> WorkspaceSnapshot:
+        """
+        Parse the JSON sources, ignoring any compiled snapshot
+        """
+        slack_path, github_path, meetings_path = self.paths
+        (_, slack_size), (_, github_size), (_, meetings_size) = stamp
+        # One symbol table per snapshot, shared by every index built from it
+        symbols = SymbolTable()
+        slack_data, slack_index = load_slack(slack_path, _should_stream(slack_size), symbols)
+        github_data, commit_store = load_github(github_path, _should_stream(github_size), symbols)
+        transcripts_data, meeting_index = load_meetings(meetings_path, _should_stream(meetings_size), symbols)
+        return WorkspaceSnapshot(
+            slack_data=slack_data,
+            github_data=github_data,
+            transcripts_data=transcripts_data,
+            stamp=stamp,
+            slack_index=slack_index,
+            commit_store=commit_store,
+            meeting_index=meeting_index,
+            symbols=symbols
+        )
+
+    def get(self) -> WorkspaceSnapshot:
+        """
+        Return the current snapshot, reloading it first if a source file changed
+        """
+        stamp = self._stat()
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.stamp == stamp:
+            return snapshot
+
+        with self._lock:
+            # Another thread may have reloaded while we waited for the lock
+            snapshot = self._snapshot
+            if snapshot is not None and snapshot.stamp == stamp:
+                return snapshot
+            try:
+                fresh = self._load(stamp)
+            except ValueError as e:
+                # A file caught mid-write fails to parse; keep serving the
+                # previous snapshot and retry on the next access.
+                if snapshot is None:
+                    raise
+                print(f"Workspace reload failed, keeping previous snapshot: {e}")
+                return snapshot
+            self._snapshot = fresh
+            return fresh
+
+
+workspace_store = WorkspaceStore()
+
+
+def get_workspace() -> WorkspaceSnapshot:
+    """
+    Return the process-wide workspace snapshot
+    """
+    return workspace_store.get()
+
+
+async def load_workspace() -> WorkspaceSnapshot:
+    """
+    get_workspace() for async callers. A reload parses the sources and other
+    callers wait on the store's lock meanwhile, so it runs in a worker thread
+    rather than on the event loop.
+    """
+    return await asyncio.to_thread(get_workspace)
+
+
+def compile_workspace(out_path: str = SNAPSHOT_PATH) -> str:
+    """
+    Compile the current JSON sources into a binary snapshot at out_path
+    """
+    store = WorkspaceStore(snapshot_path=None)
+    compile_sources(store.paths, store._stat(), out_path)
+    return out_path
+
+
+if __name__ == "__main__":
+    import sys
+
+    print(f"Compiled workspace snapshot: {compile_workspace(*sys.argv[1:2])}")